@@ -6,7 +6,7 @@
 ***************************************************************************/
 """
 
-import os
+from qgis.PyQt.QtCore import QTimer
 from qgis.PyQt.QtWidgets import QAction
 from qgis.PyQt.QtGui import QIcon
 from qgis.core import QgsApplication
@@ -20,15 +20,25 @@ class Geology_tools:
         self.provider = None
         self.toolbar = None
         self.actions = []
+        self._processing_timer = None
 
     def initProcessing(self):
         """Registra il provider nel Processing Framework."""
+        if self.provider is not None:
+            return
         self.provider = Geology_toolsProvider()
         QgsApplication.processingRegistry().addProvider(self.provider)
 
     def initGui(self):
         """Crea la toolbar e aggiunge un pulsante per ogni algoritmo."""
-        self.initProcessing()
+        import os
+
+        # La registrazione del provider viene rimandata al primo giro
+        # dell'event loop, così non pesa sull'avvio bloccante di QGIS.
+        self._processing_timer = QTimer()
+        self._processing_timer.setSingleShot(True)
+        self._processing_timer.timeout.connect(self.initProcessing)
+        self._processing_timer.start(0)
 
         # Toolbar dedicata al plugin
         self.toolbar = self.iface.addToolBar('Geology Tools')
@@ -99,7 +109,16 @@ class Geology_tools:
             self.toolbar = None
 
         self.actions.clear()
+
+        # Il provider potrebbe non essere ancora stato registrato
+        if self._processing_timer is not None:
+            self._processing_timer.stop()
+            self._processing_timer = None
+
+        if self.provider is None:
+            return
         QgsApplication.processingRegistry().removeProvider(self.provider)
+        self.provider = None
 
     def run_algorithm(self, algorithm_id):
         """
@@ -8,43 +8,74 @@ __copyright__ = '(C) 2026 by Giuseppe Cosentino'
 
 __revision__ = '$Format:%H$'
 
-from qgis.core import QgsProcessingProvider
-import os
-from qgis.PyQt.QtGui import QIcon
-from .algorithms.hydrological_analysis_algorithm import HydrologicalAnalysisStreams
-from .algorithms.ls4sm_algorithm import LateralSpreadingAlgorithm
-from .algorithms.G4PL_algorithm import GeologyAlgorithm
-from .algorithms.SZMG_algorithm import SeismicMicrozonationAlgorithm
+import importlib
+import sys
 
+from qgis.core import QgsProcessingProvider, QgsSettings
+from qgis.PyQt.QtGui import QIcon
 
+# Algorithms exposed by the provider:
+# (module path, class name, name())
+# add additional algorithms here
+_ALGORITHMS = (
+    ('.algorithms.hydrological_analysis_algorithm', 'HydrologicalAnalysisStreams',
+     'hydrological_analysis_stream_network'),
+    ('.algorithms.ls4sm_algorithm', 'LateralSpreadingAlgorithm',
+     'lateral_spreading_analysis'),
+    ('.algorithms.G4PL_algorithm', 'GeologyAlgorithm',
+     'geology_from_points_and_lines'),
+    ('.algorithms.SZMG_algorithm', 'SeismicMicrozonationAlgorithm',
+     'seismic_microzonation_morphology'),
+)
 
 
 class Geology_toolsProvider(QgsProcessingProvider):
 
+    # QgsSettings key holding the list of enabled algorithm names
+    # (all algorithms are loaded when the key is not set)
+    SETTINGS_ENABLED_KEY = 'geology_tools/enabled'
+
     def __init__(self):
         """
         Default constructor.
         """
         QgsProcessingProvider.__init__(self)
+        self._icon = None
+        # Translated once: name() is queried on every toolbox refresh/search
+        self._name = self.tr('Geology tools')
 
     def unload(self):
         """
         Unloads the provider. Any tear-down steps required by the provider
         should be implemented here.
+
+        Safe to call more than once: cached resources are simply released.
         """
-        pass
+        self._icon = None
+        # Only clear the zone index if the module was ever imported
+        szmg = sys.modules.get(__package__ + '.algorithms.SZMG_algorithm')
+        if szmg is not None:
+            szmg.clear_zone_cache()
 
     def loadAlgorithms(self):
         """
         Loads all algorithms belonging to this provider.
-        """
-        self.addAlgorithm(HydrologicalAnalysisStreams())
-        self.addAlgorithm(LateralSpreadingAlgorithm())
-        self.addAlgorithm(GeologyAlgorithm())
-        self.addAlgorithm(SeismicMicrozonationAlgorithm())
 
-        # add additional algorithms here
-        # self.addAlgorithm(MyOtherAlgorithm())
+        Only the algorithms listed under SETTINGS_ENABLED_KEY are registered;
+        the modules of disabled ones are never imported.
+        """
+        enabled = QgsSettings().value(self.SETTINGS_ENABLED_KEY, None)
+        if enabled is None:
+            enabled = [alg[2] for alg in _ALGORITHMS]
+        elif isinstance(enabled, str):
+            # QSettings returns a plain string for single-item lists
+            enabled = [enabled]
+
+        for module_path, class_name, name in _ALGORITHMS:
+            if name not in enabled:
+                continue
+            module = importlib.import_module(module_path, __package__)
+            self.addAlgorithm(getattr(module, class_name)())
 
     def id(self):
         """
@@ -61,14 +92,21 @@ class Geology_toolsProvider(QgsProcessingProvider):
 
         This string should be short (e.g. "Lastools") and localised.
         """
-        return self.tr('Geology tools')
+        return self._name
 
     def icon(self):
         """
         Should return a QIcon which is used for your provider inside
         the Processing toolbox.
+
+        The icon is built on first use and cached, since the toolbox asks
+        for it on every repaint.
         """
-        return QIcon(os.path.join(os.path.dirname(__file__), 'icon.png'))
+        if self._icon is None:
+            import os
+
+            self._icon = QIcon(os.path.join(os.path.dirname(__file__), 'icon.png'))
+        return self._icon
 
     def longName(self):
         """
@@ -77,4 +115,4 @@ class Geology_toolsProvider(QgsProcessingProvider):
         (version 2.2.1)". This string should be localised. The default
         implementation returns the same string as name().
         """
-        return self.name()
+        return self._name
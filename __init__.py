@@ -1,5 +1,7 @@
 # -*- coding: utf-8 -*-
 
+from .Geology_tools import Geology_tools as _Plugin
+
+
 def classFactory(iface):
-    from .Geology_tools import Geology_tools
-    return Geology_tools(iface)
+    return _Plugin(iface)
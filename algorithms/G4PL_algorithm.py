@@ -22,7 +22,10 @@ __date__ = '2026-02-13'
 __copyright__ = '(C) 2026 by Giuseppe Cosentino'
 __version__ = '2.0'  # Updated for QGIS 4.0
 
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
+import math
+from concurrent.futures import ThreadPoolExecutor, wait as futures_wait
+from dataclasses import dataclass
 from enum import IntEnum
 
 from qgis.PyQt.QtCore import QCoreApplication
@@ -31,19 +34,28 @@ from qgis.core import (
     QgsProcessingAlgorithm,
     QgsProcessingException,
     QgsProcessingMultiStepFeedback,
+    QgsProcessingUtils,
     QgsProcessingParameterFeatureSource,
     QgsProcessingParameterField,
     QgsProcessingParameterVectorLayer,
     QgsProcessingParameterFeatureSink,
     QgsProcessingParameterNumber,
     QgsProcessingParameterEnum,
+    QgsProcessingParameterBoolean,
     QgsWkbTypes,
+    QgsCoordinateReferenceSystem,
+    QgsFeature,
+    QgsFeatureRequest,
+    QgsFeatureSink,
     QgsFeatureSource,
+    QgsFields,
+    QgsGeometry,
+    QgsPointXY,
+    QgsSpatialIndex,
     QgsVectorLayer,
     QgsMessageLog,
     Qgis
 )
-import processing
 
 # ============================================================================
 # QGIS 4.0 / Qt6 compatibility
@@ -72,6 +84,14 @@ if Qgis.QGIS_VERSION_INT >= 40000:
     # Number type
     _NUMBER_DOUBLE = QgsProcessingParameterNumber.Type.Double
 
+    # Feature sink flags
+    _SINK_FAST_INSERT = QgsFeatureSink.Flag.FastInsert
+
+    # Wkb types
+    _WKB_POINT      = Qgis.WkbType.Point
+    _WKB_LINESTRING = Qgis.WkbType.LineString
+    _WKB_POLYGON    = Qgis.WkbType.Polygon
+
     def _wkb_display_string(wkb_type):
         return Qgis.displayString(wkb_type)
 
@@ -93,88 +113,18 @@ else:
     _FIELD_ANY     = QgsProcessingParameterField.Any
     _NUMBER_DOUBLE = QgsProcessingParameterNumber.Double
 
-    def _wkb_display_string(wkb_type):
-        return QgsWkbTypes.displayString(wkb_type)
+    _SINK_FAST_INSERT = QgsFeatureSink.FastInsert
 
+    _WKB_POINT      = QgsWkbTypes.Point
+    _WKB_LINESTRING = QgsWkbTypes.LineString
+    _WKB_POLYGON    = QgsWkbTypes.Polygon
 
-class SpatialPredicate(IntEnum):
-    """Enumeration of spatial predicates for attribute joining."""
-    INTERSECTS = 0
-    CONTAINS = 1
-    WITHIN = 2
-    OVERLAPS = 3
-
-
-class GeologyAlgorithm(QgsProcessingAlgorithm):
-    """
-    QGIS Processing Algorithm for creating geological maps from point and line data.
-
-    This algorithm automates the generation of geological polygons and contact lines
-    by combining:
-    - Point features containing geological attributes (formation codes, lithology, etc.)
-    - Line features representing geological contacts
-
-    The workflow:
-    1. Cleans duplicate geometries from input points
-    2. Polygonizes line features to create enclosed areas
-    3. Joins geological attributes from points to polygons using spatial predicates
-    4. Generates geological contact lines with inherited attributes
-    5. Produces clean, topologically correct output layers
-
-    Use cases:
-    - Digital geological mapping
-    - Geological unit boundary generation
-    - Automated cartographic production
-    - Geological database construction
-    """
-
-    # Input parameter names
-    INPUT_POINTS = 'points_with_geological_information'
-    INPUT_ATTRIBUTE = 'geological_attribute_field'
-    INPUT_LINES = 'line_drawing_geological_contacts'
-    TOLERANCE = 'vertex_tolerance'
-    SPATIAL_PREDICATE = 'spatial_predicate'
-
-    # Output parameter names
-    OUTPUT_POLYGONS = 'intermediate_polygons'
-    OUTPUT_CLEAN_POINTS = 'clean_points'
-    OUTPUT_SEGMENTS = 'line_segments'
-    OUTPUT_GEOLOGICAL_POLYGONS = 'geological_polygons'
-    OUTPUT_CONTACTS = 'geological_contacts'
-
-    # Processing constants
-    DEFAULT_TOLERANCE = 0.000001
-    MIN_TOLERANCE = 0.0
-    TOTAL_STEPS = 10
-
-    # Join method
-    JOIN_METHOD_ONE_TO_MANY = 0
-
-    def __init__(self):
-        """Initialize the algorithm."""
-        super().__init__()
-
-    # ========================================================================
-    # Translation and Metadata Methods
-    # ========================================================================
-
-    def tr(self, string: str) -> str:
-        return QCoreApplication.translate('Processing', string)
-
-    def name(self) -> str:
-        return 'geology_from_points_and_lines'
-
-    def displayName(self) -> str:
-        return self.tr('Geology from Points and Lines')
-
-    def group(self) -> str:
-        return self.tr('Geological Mapping')
+    def _wkb_display_string(wkb_type):
+        return QgsWkbTypes.displayString(wkb_type)
 
-    def groupId(self) -> str:
-        return 'geological_mapping'
 
-    def shortHelpString(self) -> str:
-        return self.tr("""<html><body>
+# Help text shown in the algorithm dialog, built once at import
+_SHORT_HELP = """<html><body>
 <h2>Accurate geological drawing</h2>
 
 <p>This algorithm creates a digital geological map from point and line data,
@@ -227,12 +177,20 @@ such as formation codes, lithology, age, etc.</li>
 <li>Adjust based on coordinate system and required precision</li>
 </ul>
 
+<p><b>Pre-simplify Lines:</b></p>
+<ul>
+<li>Off by default; when enabled, oversampled contact lines are simplified
+(Douglas-Peucker) after they are noded, so line junctions stay in place</li>
+<li>The tolerance defaults to the vertex tolerance when left empty</li>
+<li>Speeds up dense digitizations at the cost of small boundary shifts</li>
+</ul>
+
 <p><b>Spatial Predicate:</b></p>
 <ul>
 <li><b>Intersects:</b> Point touches or is inside polygon (most common)</li>
 <li><b>Contains:</b> Polygon completely contains point</li>
 <li><b>Within:</b> Point is completely within polygon</li>
-<li><b>Overlaps:</b> Geometries share some but not all points</li>
+<li><b>Overlaps:</b> Point lies on the polygon boundary</li>
 </ul>
 
 <h3>Outputs:</h3>
@@ -258,7 +216,144 @@ such as formation codes, lithology, age, etc.</li>
 <li>Useful for quality control and troubleshooting</li>
 </ul>
 
-</body></html>""")
+</body></html>"""
+
+# Keeps the (possibly negative) grid row in the low 64 bits of a packed vertex key
+_GRID_ROW_MASK = (1 << 64) - 1
+
+
+class SpatialPredicate(IntEnum):
+    """Enumeration of spatial predicates for attribute joining."""
+    INTERSECTS = 0
+    CONTAINS = 1
+    WITHIN = 2
+    OVERLAPS = 3
+
+
+@dataclass
+class _FeatureBatch:
+    """Features kept in memory between processing steps."""
+    fields: QgsFields
+    wkb_type: Any
+    crs: QgsCoordinateReferenceSystem
+    features: List[QgsFeature]
+
+    @classmethod
+    def from_source(
+        cls, source: QgsFeatureSource, request: Optional[QgsFeatureRequest] = None
+    ) -> '_FeatureBatch':
+        """Read every feature of a source once (optionally limited by a request)."""
+        features = source.getFeatures(request) if request is not None else source.getFeatures()
+        return cls(source.fields(), source.wkbType(), source.sourceCrs(), list(features))
+
+    def derive(self, features, fields=None, wkb_type=None) -> '_FeatureBatch':
+        """Return a batch in the same CRS, optionally with new fields / geometry type."""
+        return _FeatureBatch(
+            self.fields if fields is None else fields,
+            self.wkb_type if wkb_type is None else wkb_type,
+            self.crs,
+            features
+        )
+
+
+class GeologyAlgorithm(QgsProcessingAlgorithm):
+    """
+    QGIS Processing Algorithm for creating geological maps from point and line data.
+
+    This algorithm automates the generation of geological polygons and contact lines
+    by combining:
+    - Point features containing geological attributes (formation codes, lithology, etc.)
+    - Line features representing geological contacts
+
+    The workflow:
+    1. Cleans duplicate geometries from input points
+    2. Polygonizes line features to create enclosed areas
+    3. Joins geological attributes from points to polygons using spatial predicates
+    4. Generates geological contact lines with inherited attributes
+    5. Produces clean, topologically correct output layers
+
+    Use cases:
+    - Digital geological mapping
+    - Geological unit boundary generation
+    - Automated cartographic production
+    - Geological database construction
+    """
+
+    # Input parameter names
+    INPUT_POINTS = 'points_with_geological_information'
+    INPUT_ATTRIBUTE = 'geological_attribute_field'
+    INPUT_LINES = 'line_drawing_geological_contacts'
+    TOLERANCE = 'vertex_tolerance'
+    SPATIAL_PREDICATE = 'spatial_predicate'
+    PRE_SIMPLIFY = 'pre_simplify_lines'
+    PRE_SIMPLIFY_TOLERANCE = 'pre_simplify_tolerance'
+
+    # Output parameter names
+    OUTPUT_POLYGONS = 'intermediate_polygons'
+    OUTPUT_CLEAN_POINTS = 'clean_points'
+    OUTPUT_SEGMENTS = 'line_segments'
+    OUTPUT_GEOLOGICAL_POLYGONS = 'geological_polygons'
+    OUTPUT_CONTACTS = 'geological_contacts'
+
+    # Outputs the user may skip
+    INTERMEDIATE_OUTPUTS = (OUTPUT_POLYGONS, OUTPUT_CLEAN_POINTS, OUTPUT_SEGMENTS)
+
+    # Processing constants
+    DEFAULT_TOLERANCE = 0.000001
+    MIN_TOLERANCE = 0.0
+    TOTAL_STEPS = 4
+    # Features per addFeatures call when writing outputs
+    SINK_BATCH_SIZE = 1000
+    # Line count from which polygonization runs on a worker thread
+    PARALLEL_MIN_LINES = 500
+    # Share of dangling line endpoints above which the network is reported
+    # as unlikely to close into polygons
+    DANGLING_WARNING_RATIO = 0.5
+
+    # Spatial predicate -> polygon-side QgsGeometryEngine test, resolved once
+    # per run (a point within a polygon is the polygon containing it)
+    _PRED_MAP = {
+        SpatialPredicate.INTERSECTS: 'intersects',
+        SpatialPredicate.CONTAINS: 'contains',
+        SpatialPredicate.WITHIN: 'contains',
+        # A point cannot overlap a polygon; option 3 has always been passed
+        # on as joinattributesbylocation's 3, which is "touches"
+        SpatialPredicate.OVERLAPS: 'touches',
+    }
+
+    def __init__(self):
+        """Initialize the algorithm."""
+        super().__init__()
+        self._reset_run_state()
+        # Step messages are translated once instead of on every run
+        self._step_messages = (
+            self.tr('Step {step}/{total}: Cleaning duplicate point geometries...'),
+            self.tr('Step {step}/{total}: Creating polygons from line network...'),
+            self.tr('Step {step}/{total}: Joining geological attributes to polygons...'),
+            self.tr('Step {step}/{total}: Extracting geological contacts (tolerance: {tolerance})...'),
+        )
+
+    # ========================================================================
+    # Translation and Metadata Methods
+    # ========================================================================
+
+    def tr(self, string: str) -> str:
+        return QCoreApplication.translate('Processing', string)
+
+    def name(self) -> str:
+        return 'geology_from_points_and_lines'
+
+    def displayName(self) -> str:
+        return self.tr('Geology from Points and Lines')
+
+    def group(self) -> str:
+        return self.tr('Geological Mapping')
+
+    def groupId(self) -> str:
+        return 'geological_mapping'
+
+    def shortHelpString(self) -> str:
+        return self.tr(_SHORT_HELP)
 
     def createInstance(self) -> 'GeologyAlgorithm':
         return GeologyAlgorithm()
@@ -318,6 +413,26 @@ such as formation codes, lithology, age, etc.</li>
             )
         )
 
+        # Advanced parameter: Douglas-Peucker pre-simplification of the lines
+        self.addParameter(
+            QgsProcessingParameterBoolean(
+                self.PRE_SIMPLIFY,
+                self.tr('Pre-simplify Lines before Polygonization'),
+                defaultValue=False
+            )
+        )
+
+        self.addParameter(
+            QgsProcessingParameterNumber(
+                self.PRE_SIMPLIFY_TOLERANCE,
+                self.tr('Pre-simplification Tolerance (empty = vertex tolerance)'),
+                type=_NUMBER_DOUBLE,
+                minValue=self.MIN_TOLERANCE,
+                defaultValue=None,
+                optional=True
+            )
+        )
+
         # Advanced parameter: Spatial predicate
         self.addParameter(
             QgsProcessingParameterEnum(
@@ -340,6 +455,7 @@ such as formation codes, lithology, age, etc.</li>
                 self.OUTPUT_POLYGONS,
                 self.tr('Polygons (Intermediate)'),
                 type=_TYPE_POLYGON,            # ← QGIS 4.0: Qgis.ProcessingSourceType.VectorPolygon
+                optional=True,
                 createByDefault=True,
                 defaultValue='TEMPORARY_OUTPUT'
             )
@@ -351,6 +467,7 @@ such as formation codes, lithology, age, etc.</li>
                 self.OUTPUT_CLEAN_POINTS,
                 self.tr('Clean Points (Intermediate)'),
                 type=_TYPE_POINT,
+                optional=True,
                 createByDefault=True,
                 defaultValue='TEMPORARY_OUTPUT'
             )
@@ -362,6 +479,7 @@ such as formation codes, lithology, age, etc.</li>
                 self.OUTPUT_SEGMENTS,
                 self.tr('Line Segments (Intermediate)'),
                 type=_TYPE_LINE,
+                optional=True,
                 createByDefault=True,
                 defaultValue='TEMPORARY_OUTPUT'
             )
@@ -408,9 +526,6 @@ such as formation codes, lithology, age, etc.</li>
         if points_source is None:
             return False, self.tr('Invalid points layer')
 
-        if points_source.featureCount() == 0:
-            return False, self.tr('Points layer is empty')
-
         # Validate point geometry type
         geom_type = points_source.wkbType()
         if QgsWkbTypes.geometryType(geom_type) != _GEOM_POINT:  # ← QGIS 4.0: Qgis.GeometryType.Point
@@ -421,9 +536,6 @@ such as formation codes, lithology, age, etc.</li>
         if lines_layer is None:
             return False, self.tr('Invalid lines layer')
 
-        if lines_layer.featureCount() == 0:
-            return False, self.tr('Lines layer is empty')
-
         # Validate line geometry type
         geom_type = lines_layer.wkbType()
         if QgsWkbTypes.geometryType(geom_type) != _GEOM_LINE:   # ← QGIS 4.0: Qgis.GeometryType.Line
@@ -435,14 +547,14 @@ such as formation codes, lithology, age, etc.</li>
             return False, self.tr('Geological attribute field must be specified')
 
         if attribute_field not in points_source.fields().names():
-            return False, self.tr(f'Field "{attribute_field}" not found in points layer')
+            return False, self.tr('Field "{}" not found in points layer').format(attribute_field)
 
         # Validate tolerance
         tolerance = self.parameterAsDouble(parameters, self.TOLERANCE, context)
         if tolerance < self.MIN_TOLERANCE:
-            return False, self.tr('Tolerance must be greater than or equal to {}'.format(
+            return False, self.tr('Tolerance must be greater than or equal to {}').format(
                 self.MIN_TOLERANCE
-            ))
+            )
 
         return super().checkParameterValues(parameters, context)
 
@@ -461,163 +573,144 @@ such as formation codes, lithology, age, etc.</li>
         """
         feedback = QgsProcessingMultiStepFeedback(self.TOTAL_STEPS, model_feedback)
         results = {}
-        outputs = {}
 
         try:
             tolerance = self.parameterAsDouble(parameters, self.TOLERANCE, context)
             spatial_predicate = self.parameterAsEnum(parameters, self.SPATIAL_PREDICATE, context)
             attribute_field = self.parameterAsString(parameters, self.INPUT_ATTRIBUTE, context)
-
-            feedback.pushInfo(self.tr('=' * 60))
-            feedback.pushInfo(self.tr('Starting Geological Mapping Process'))
-            feedback.pushInfo(self.tr('=' * 60))
-            feedback.pushInfo(self.tr(f'Geological attribute field: {attribute_field}'))
-            feedback.pushInfo(self.tr(f'Vertex tolerance: {tolerance}'))
-            feedback.pushInfo('')
-
-            # Step 1: Clean duplicate point geometries
-            feedback.pushInfo(self.tr('Step 1/{}: Cleaning duplicate point geometries...').format(
-                self.TOTAL_STEPS
-            ))
-            outputs['clean_points'] = self._remove_duplicate_points(
-                parameters, context, feedback
+            simplify_tolerance = 0.0
+            if self.parameterAsBoolean(parameters, self.PRE_SIMPLIFY, context):
+                simplify_tolerance = tolerance
+                if parameters.get(self.PRE_SIMPLIFY_TOLERANCE) is not None:
+                    simplify_tolerance = self.parameterAsDouble(
+                        parameters, self.PRE_SIMPLIFY_TOLERANCE, context
+                    )
+
+            feedback.pushInfo('\n'.join((
+                '=' * 60,
+                self.tr('Starting Geological Mapping Process'),
+                '=' * 60,
+                self.tr('Geological attribute field: {}').format(attribute_field),
+                self.tr('Vertex tolerance: {}').format(tolerance),
+                '',
+            )))
+
+            # Steps 1 and 2 are independent: the lines are read here and, for
+            # larger networks, polygonized on a worker thread (in-memory
+            # geometries only, feedback is used just for cancellation) while
+            # the points are deduplicated on this thread. Small networks are
+            # polygonized inline, where a thread would cost more than it saves.
+            # Polygons only keep the line fields, not their values
+            lines = _FeatureBatch.from_source(
+                self.parameterAsVectorLayer(parameters, self.INPUT_LINES, context),
+                QgsFeatureRequest().setNoAttributes()
             )
-            results[self.OUTPUT_CLEAN_POINTS] = outputs['clean_points']
+            # Emptiness is checked on the read the pipeline needs anyway,
+            # instead of a separate count/probe in checkParameterValues
+            if not lines.features:
+                raise QgsProcessingException(self.tr('Lines layer is empty'))
+            self._check_line_endpoints(lines, tolerance, feedback)
+            polygonize_future = None
+            if len(lines.features) >= self.PARALLEL_MIN_LINES:
+                executor = ThreadPoolExecutor(max_workers=1)
+                polygonize_future = executor.submit(
+                    self._polygonize_lines, lines, simplify_tolerance, feedback
+                )
+                executor.shutdown(wait=False)
+
+            try:
+                # Step 1: Clean duplicate point geometries
+                self._push_step(feedback, 1)
+                points_source = self.parameterAsSource(parameters, self.INPUT_POINTS, context)
+                points_request = None
+                if parameters.get(self.OUTPUT_CLEAN_POINTS) is None:
+                    # Only the join reads the points: fetch just the geological attribute
+                    points_request = QgsFeatureRequest().setSubsetOfAttributes(
+                        [points_source.fields().lookupField(attribute_field)]
+                    )
+                points = _FeatureBatch.from_source(points_source, points_request)
+                if not points.features:
+                    raise QgsProcessingException(self.tr('Points layer is empty'))
+                points = self._dedup_geometries(points, feedback)
+                results[self.OUTPUT_CLEAN_POINTS] = self._write_sink(
+                    points, self.OUTPUT_CLEAN_POINTS, parameters, context
+                )
+            finally:
+                # The worker holds the feedback object: never let it outlive
+                # this method, e.g. when step 1 raises
+                if polygonize_future is not None:
+                    futures_wait([polygonize_future])
 
             feedback.setCurrentStep(1)
-            if feedback.isCanceled():
-                return {}
 
             # Step 2: Polygonize lines
-            feedback.pushInfo(self.tr('Step 2/{}: Creating polygons from line network...').format(
-                self.TOTAL_STEPS
-            ))
-            outputs['polygons'] = self._polygonize_lines(
-                parameters, context, feedback
-            )
+            self._push_step(feedback, 2)
+            if polygonize_future is not None:
+                polygons = polygonize_future.result()
+            else:
+                polygons = self._polygonize_lines(lines, simplify_tolerance, feedback)
+            # Each batch is released as soon as its last consumer is done, so
+            # peak memory holds at most two stages of features at a time
+            lines = polygonize_future = None
 
             feedback.setCurrentStep(2)
             if feedback.isCanceled():
                 return {}
 
-            if not outputs['polygons']:
+            if not polygons.features:
                 raise QgsProcessingException(
                     self.tr('Polygonization failed. Ensure lines form closed polygons without gaps.')
                 )
 
-            # Step 3: Clean duplicate polygon geometries
-            feedback.pushInfo(self.tr('Step 3/{}: Cleaning duplicate polygon geometries...').format(
-                self.TOTAL_STEPS
-            ))
-            outputs['clean_polygons'] = self._remove_duplicate_polygons(
-                outputs['polygons'], parameters, context, feedback
+            # GEOS polygonize returns each face of the planar partition once,
+            # so the polygons need no duplicate-geometry pass
+            results[self.OUTPUT_POLYGONS] = self._write_sink(
+                polygons, self.OUTPUT_POLYGONS, parameters, context
             )
-            results[self.OUTPUT_POLYGONS] = outputs['clean_polygons']
 
-            feedback.setCurrentStep(3)
-            if feedback.isCanceled():
-                return {}
-
-            # Step 4: Join geological attributes
-            feedback.pushInfo(self.tr('Step 4/{}: Joining geological attributes to polygons...').format(
-                self.TOTAL_STEPS
-            ))
-            outputs['geological_polygons'] = self._join_attributes_to_polygons(
-                outputs['clean_polygons'],
-                outputs['clean_points'],
+            # Step 3: Join geological attributes
+            self._push_step(feedback, 3)
+            geological_polygons = self._join_attributes_to_polygons(
+                polygons,
+                points,
                 attribute_field,
                 spatial_predicate,
-                parameters,
-                context,
                 feedback
             )
-            results[self.OUTPUT_GEOLOGICAL_POLYGONS] = outputs['geological_polygons']
+            results[self.OUTPUT_GEOLOGICAL_POLYGONS] = self._write_sink(
+                geological_polygons, self.OUTPUT_GEOLOGICAL_POLYGONS, parameters, context
+            )
+            polygons = points = None
 
-            feedback.setCurrentStep(4)
+            feedback.setCurrentStep(3)
             if feedback.isCanceled():
                 return {}
 
-            self._validate_attribute_join(
-                outputs['geological_polygons'],
+            self._validate_attribute_join(geological_polygons, feedback)
+
+            # Step 4: Extract geological contacts
+            self._push_step(feedback, 4, tolerance=tolerance)
+            segments, contacts = self._extract_contacts(
+                geological_polygons,
                 attribute_field,
-                context,
+                tolerance,
                 feedback
             )
-
-            # Step 5: Convert polygons to lines
-            feedback.pushInfo(self.tr('Step 5/{}: Converting polygons to boundary lines...').format(
-                self.TOTAL_STEPS
-            ))
-            outputs['polygon_lines'] = self._convert_polygons_to_lines(
-                outputs['geological_polygons'], context, feedback
-            )
-
-            feedback.setCurrentStep(5)
-            if feedback.isCanceled():
-                return {}
-
-            # Step 6: Remove duplicate vertices
-            feedback.pushInfo(self.tr('Step 6/{}: Removing duplicate vertices (tolerance: {})...').format(
-                self.TOTAL_STEPS, tolerance
-            ))
-            outputs['cleaned_lines'] = self._remove_duplicate_vertices(
-                outputs['polygon_lines'], tolerance, context, feedback
-            )
-
-            feedback.setCurrentStep(6)
-            if feedback.isCanceled():
-                return {}
-
-            # Step 7: Explode lines to segments
-            feedback.pushInfo(self.tr('Step 7/{}: Exploding lines into segments...').format(
-                self.TOTAL_STEPS
-            ))
-            outputs['exploded_lines'] = self._explode_lines(
-                outputs['cleaned_lines'], context, feedback
+            geological_polygons = None
+            results[self.OUTPUT_SEGMENTS] = self._write_sink(
+                segments, self.OUTPUT_SEGMENTS, parameters, context
             )
-
-            feedback.setCurrentStep(7)
-            if feedback.isCanceled():
-                return {}
-
-            # Step 8: Clean duplicate line segments
-            feedback.pushInfo(self.tr('Step 8/{}: Cleaning duplicate line segments...').format(
-                self.TOTAL_STEPS
-            ))
-            outputs['clean_segments'] = self._remove_duplicate_line_segments(
-                outputs['exploded_lines'], parameters, context, feedback
+            segments = None
+            results[self.OUTPUT_CONTACTS] = self._write_sink(
+                contacts, self.OUTPUT_CONTACTS, parameters, context
             )
-            results[self.OUTPUT_SEGMENTS] = outputs['clean_segments']
 
-            feedback.setCurrentStep(8)
-            if feedback.isCanceled():
-                return {}
-
-            # Step 9: Dissolve by geological attribute
-            feedback.pushInfo(self.tr('Step 9/{}: Dissolving lines by geological attribute...').format(
-                self.TOTAL_STEPS
-            ))
-            outputs['dissolved_lines'] = self._dissolve_by_attribute(
-                outputs['clean_segments'], attribute_field, context, feedback
-            )
-
-            feedback.setCurrentStep(9)
-            if feedback.isCanceled():
-                return {}
-
-            # Step 10: Convert multipart to singleparts
-            feedback.pushInfo(self.tr('Step 10/{}: Converting to single-part features...').format(
-                self.TOTAL_STEPS
-            ))
-            outputs['contacts'] = self._multipart_to_singleparts(
-                outputs['dissolved_lines'], parameters, context, feedback
-            )
-            results[self.OUTPUT_CONTACTS] = outputs['contacts']
-
-            feedback.pushInfo('')
-            feedback.pushInfo(self.tr('=' * 60))
-            feedback.pushInfo(self.tr('✓ Geological mapping completed successfully!'))
-            feedback.pushInfo(self.tr('=' * 60))
+            feedback.pushInfo('\n'.join((
+                '',
+                '=' * 60,
+                self.tr('✓ Geological mapping completed successfully!'),
+                '=' * 60,
+            )))
             self._print_summary(results, context, feedback)
 
             return results
@@ -625,179 +718,463 @@ such as formation codes, lithology, age, etc.</li>
         except QgsProcessingException:
             raise
         except Exception as e:
-            error_msg = self.tr(f'Unexpected error during processing: {str(e)}')
+            error_msg = self.tr('Unexpected error during processing: {}').format(e)
             self._log_error(error_msg)
             raise QgsProcessingException(error_msg)
+        finally:
+            # Per-run state shared between the steps (join -> contacts,
+            # writes -> summary) must not leak into the next run
+            self._reset_run_state()
+
+    def _reset_run_state(self) -> None:
+        """Drop the state the steps share during a single run."""
+        # Position of the source polygon of each feature produced by the join
+        self._join_sources = []
+        # Output layers opened for reporting (see _get_layer)
+        self._layer_cache = {}
+        # Output id -> (feature count, wkb type) written to it by _write_sink
+        self._written_outputs = {}
 
     # ========================================================================
     # Helper Methods for Processing Steps
     # ========================================================================
 
-    def _remove_duplicate_points(self, parameters, context, feedback) -> str:
-        alg_params = {
-            'INPUT': parameters[self.INPUT_POINTS],
-            'OUTPUT': parameters[self.OUTPUT_CLEAN_POINTS]
-        }
-        result = processing.run(
-            'native:deleteduplicategeometries',
-            alg_params, context=context, feedback=feedback, is_child_algorithm=True
-        )
-        return result['OUTPUT']
-
-    def _polygonize_lines(self, parameters, context, feedback) -> str:
-        alg_params = {
-            'INPUT': parameters[self.INPUT_LINES],
-            'KEEP_FIELDS': True,
-            'OUTPUT': QgsProcessing.TEMPORARY_OUTPUT
-        }
-        result = processing.run(
-            'native:polygonize',
-            alg_params, context=context, feedback=feedback, is_child_algorithm=True
-        )
-        return result['OUTPUT']
-
-    def _remove_duplicate_polygons(self, input_layer, parameters, context, feedback) -> str:
-        alg_params = {
-            'INPUT': input_layer,
-            'OUTPUT': parameters[self.OUTPUT_POLYGONS]
-        }
-        result = processing.run(
-            'native:deleteduplicategeometries',
-            alg_params, context=context, feedback=feedback, is_child_algorithm=True
+    def _push_step(self, feedback: Any, step: int, **kwargs: Any) -> None:
+        """Report the start of a processing step."""
+        feedback.pushInfo(self._step_messages[step - 1].format(
+            step=step, total=self.TOTAL_STEPS, **kwargs
+        ))
+
+    def _dedup_geometries(self, batch: '_FeatureBatch', feedback: Any) -> '_FeatureBatch':
+        """
+        Drop features whose geometry duplicates an earlier one.
+
+        Single pass over a hash set of geometry keys (see _geometry_key), instead
+        of the spatial index + pairwise GEOS equality of native:deleteduplicategeometries.
+        """
+        count = len(batch.features)
+        total = 100.0 / count if count > 0 else 0
+        seen = set()
+        unique = []
+
+        for current, feature in enumerate(batch.features):
+            if feedback.isCanceled():
+                break
+
+            geometry = feature.geometry()
+            if not geometry.isNull():
+                key = self._geometry_key(geometry)
+                if key in seen:
+                    continue
+                seen.add(key)
+
+            unique.append(feature)
+            feedback.setProgress(int(current * total))
+
+        duplicates = count - len(unique)
+        if duplicates and not feedback.isCanceled():
+            feedback.pushInfo(self.tr('  Removed {} duplicate geometries').format(duplicates))
+
+        return batch.derive(unique)
+
+    @staticmethod
+    def _geometry_key(geometry: QgsGeometry) -> Any:
+        """
+        Return a hashable key that is equal for duplicate geometries.
+
+        Plain 2D points are keyed on their coordinates, without serializing
+        them to WKB; everything else is keyed on its WKB. (Contact segments
+        are deduplicated on their sorted endpoint keys in _extract_contacts.)
+        """
+        if geometry.wkbType() == _WKB_POINT:
+            point = geometry.constGet()
+            return (point.x(), point.y())
+        return bytes(geometry.asWkb())
+
+    def _write_sink(
+        self,
+        batch: '_FeatureBatch',
+        output_name: str,
+        parameters: Dict[str, Any],
+        context: Any
+    ) -> Optional[str]:
+        """
+        Write a batch to one of the declared output sinks and return its id.
+
+        Intermediate outputs are optional: when the user skips one, nothing
+        is written and None is returned.
+        """
+        if output_name in self.INTERMEDIATE_OUTPUTS and parameters.get(output_name) is None:
+            return None
+
+        sink, dest_id = self.parameterAsSink(
+            parameters, output_name, context,
+            batch.fields, batch.wkb_type, batch.crs
         )
-        return result['OUTPUT']
+        if sink is None:
+            raise QgsProcessingException(self.invalidSinkError(parameters, output_name))
+
+        # Written in fixed-size chunks: one addFeatures call per chunk, while
+        # the temporary C++ copy of the feature list stays bounded
+        features = batch.features
+        for start in range(0, len(features), self.SINK_BATCH_SIZE):
+            sink.addFeatures(features[start:start + self.SINK_BATCH_SIZE], _SINK_FAST_INSERT)
+        self._written_outputs[dest_id] = (len(batch.features), batch.wkb_type)
+        return dest_id
+
+    def _check_line_endpoints(self, lines: '_FeatureBatch', tolerance: float, feedback: Any) -> None:
+        """
+        Warn before polygonizing a line network that mostly does not close.
+
+        Line endpoints are counted on the vertex tolerance grid in a single
+        pass; an endpoint met only once is dangling. Lines that cross without
+        sharing a vertex can still close polygons once noded, so this only
+        warns and the polygonize result stays the authority.
+        """
+        scale = 1.0 / tolerance if tolerance > 0 else 0.0
+        degrees = {}
+        for feature in lines.features:
+            geometry = feature.geometry()
+            if geometry.isNull():
+                continue
+            for part in geometry.constParts():
+                for key in self._ring_keys((part.startPoint(), part.endPoint()), scale):
+                    degrees[key] = degrees.get(key, 0) + 1
+
+        if not degrees:
+            return
+        dangling = sum(1 for degree in degrees.values() if degree == 1)
+        if dangling == len(degrees):
+            feedback.pushWarning(self.tr(
+                'No line endpoint is shared with another line: polygons can only '
+                'come from lines crossing each other. Check the lines are snapped.'
+            ))
+        elif dangling > len(degrees) * self.DANGLING_WARNING_RATIO:
+            feedback.pushWarning(self.tr(
+                '{} of {} line endpoints are dangling: parts of the network may not close into polygons'
+            ).format(dangling, len(degrees)))
+
+    def _polygonize_lines(
+        self, lines: '_FeatureBatch', simplify_tolerance: float, feedback: Any
+    ) -> '_FeatureBatch':
+        """
+        Build polygons from the line network.
+
+        The lines are noded with a chunked unary union and handed to GEOS
+        polygonize in-process, instead of going through native:polygonize and
+        a temporary layer. As with KEEP_FIELDS, the polygons carry the line
+        fields with empty values. A positive simplify_tolerance thins
+        oversampled lines (topology-preserving Douglas-Peucker) once they are
+        noded: every junction is then an endpoint of the noded edges, which
+        the simplification keeps in place, so T-junctions are not opened.
+        """
+        geometries = [
+            feature.geometry() for feature in lines.features
+            if not feature.geometry().isNull()
+        ]
+        if feedback.isCanceled() or not geometries:
+            return lines.derive([], wkb_type=_WKB_POLYGON)
+
+        # Large networks are noded in ~sqrt(n) chunks whose partial unions
+        # are then merged, rather than in a single union of every line.
+        chunk_size = int(math.sqrt(len(geometries)))
+        if chunk_size > 1:
+            partials = []
+            for start in range(0, len(geometries), chunk_size):
+                if feedback.isCanceled():
+                    return lines.derive([], wkb_type=_WKB_POLYGON)
+                partials.append(QgsGeometry.unaryUnion(geometries[start:start + chunk_size]))
+            geometries = partials
+
+        noded = QgsGeometry.unaryUnion(geometries)
+        if simplify_tolerance > 0:
+            noded = noded.simplify(simplify_tolerance)
+        polygonized = QgsGeometry.polygonize([noded])
+
+        polygons = []
+        for part in polygonized.asGeometryCollection():
+            feature = QgsFeature(lines.fields)
+            feature.setGeometry(part)
+            polygons.append(feature)
+
+        return lines.derive(polygons, wkb_type=_WKB_POLYGON)
 
     def _join_attributes_to_polygons(
-        self, polygons_layer, points_layer, attribute_field,
-        spatial_predicate, parameters, context, feedback
-    ) -> str:
-        alg_params = {
-            'DISCARD_NONMATCHING': True,
-            'INPUT': polygons_layer,
-            'JOIN': points_layer,
-            'JOIN_FIELDS': [attribute_field],
-            'METHOD': self.JOIN_METHOD_ONE_TO_MANY,
-            'PREDICATE': [spatial_predicate],
-            'PREFIX': '',
-            'OUTPUT': parameters[self.OUTPUT_GEOLOGICAL_POLYGONS]
-        }
-        result = processing.run(
-            'native:joinattributesbylocation',
-            alg_params, context=context, feedback=feedback, is_child_algorithm=True
-        )
-        return result['OUTPUT']
-
-    def _convert_polygons_to_lines(self, input_layer, context, feedback) -> str:
-        alg_params = {
-            'INPUT': input_layer,
-            'OUTPUT': QgsProcessing.TEMPORARY_OUTPUT
-        }
-        result = processing.run(
-            'native:polygonstolines',
-            alg_params, context=context, feedback=feedback, is_child_algorithm=True
-        )
-        return result['OUTPUT']
-
-    def _remove_duplicate_vertices(self, input_layer, tolerance, context, feedback) -> str:
-        alg_params = {
-            'INPUT': input_layer,
-            'TOLERANCE': tolerance,
-            'USE_Z_VALUE': False,
-            'OUTPUT': QgsProcessing.TEMPORARY_OUTPUT
-        }
-        result = processing.run(
-            'native:removeduplicatevertices',
-            alg_params, context=context, feedback=feedback, is_child_algorithm=True
-        )
-        return result['OUTPUT']
-
-    def _explode_lines(self, input_layer, context, feedback) -> str:
-        alg_params = {
-            'INPUT': input_layer,
-            'OUTPUT': QgsProcessing.TEMPORARY_OUTPUT
-        }
-        result = processing.run(
-            'native:explodelines',
-            alg_params, context=context, feedback=feedback, is_child_algorithm=True
-        )
-        return result['OUTPUT']
-
-    def _remove_duplicate_line_segments(self, input_layer, parameters, context, feedback) -> str:
-        alg_params = {
-            'INPUT': input_layer,
-            'OUTPUT': parameters[self.OUTPUT_SEGMENTS]
-        }
-        result = processing.run(
-            'native:deleteduplicategeometries',
-            alg_params, context=context, feedback=feedback, is_child_algorithm=True
-        )
-        return result['OUTPUT']
-
-    def _dissolve_by_attribute(self, input_layer, attribute_field, context, feedback) -> str:
-        alg_params = {
-            'FIELD': [attribute_field],
-            'INPUT': input_layer,
-            'SEPARATE_DISJOINT': False,
-            'OUTPUT': QgsProcessing.TEMPORARY_OUTPUT
-        }
-        result = processing.run(
-            'native:dissolve',
-            alg_params, context=context, feedback=feedback, is_child_algorithm=True
-        )
-        return result['OUTPUT']
-
-    def _multipart_to_singleparts(self, input_layer, parameters, context, feedback) -> str:
-        alg_params = {
-            'INPUT': input_layer,
-            'OUTPUT': parameters[self.OUTPUT_CONTACTS]
-        }
-        result = processing.run(
-            'native:multiparttosingleparts',
-            alg_params, context=context, feedback=feedback, is_child_algorithm=True
-        )
-        return result['OUTPUT']
+        self, polygons, points, attribute_field, spatial_predicate, feedback
+    ) -> '_FeatureBatch':
+        """
+        Transfer the geological attribute of each point to the polygons it falls in.
+
+        The points, usually about one per polygon, are indexed in a
+        QgsSpatialIndex, and each polygon only tests the points inside its
+        bounding box, instead of running native:joinattributesbylocation. As in
+        the one-to-many join it replaces, a polygon is emitted once per matching
+        point (in point order) and polygons without a match are discarded.
+        """
+        attribute_index = points.fields.lookupField(attribute_field)
+        join_fields = QgsFields()
+        join_fields.append(points.fields.at(attribute_index))
+        output_fields = QgsProcessingUtils.combineFields(polygons.fields, join_fields)
+
+        predicate = self._PRED_MAP[SpatialPredicate(spatial_predicate)]
+
+        # Points are indexed by their position in the batch; they are tested
+        # as-is (constGet), without building another geometry.
+        index = QgsSpatialIndex()
+        point_geometries = []
+        # Abstract geometry of each point, fetched once here rather than for
+        # every candidate test (point_geometries keeps them alive)
+        point_abstracts = []
+        point_values = []
+        for position, point in enumerate(points.features):
+            geometry = point.geometry()
+            point_geometries.append(geometry)
+            point_abstracts.append(geometry.constGet())
+            point_values.append(point.attribute(attribute_index))
+            if not geometry.isNull():
+                index.addFeature(position, geometry.boundingBox())
+
+        count = len(polygons.features)
+        total = 100.0 / count if count > 0 else 0
+        joined = []
+        self._join_sources = []
+        for position, polygon in enumerate(polygons.features):
+            if feedback.isCanceled():
+                break
+
+            geometry = polygon.geometry()
+            if geometry.isNull():
+                continue
+            candidates = index.intersects(geometry.boundingBox())
+            if not candidates:
+                continue
+
+            # One engine per polygon, released when the polygon is done. It is
+            # only prepared when several points share it: for the usual single
+            # candidate, building the prepared geometry costs more than the
+            # one test it would speed up.
+            engine = QgsGeometry.createGeometryEngine(geometry.constGet())
+            if len(candidates) > 1:
+                engine.prepareGeometry()
+            test = getattr(engine, predicate)
+
+            base_attributes = None
+            for point_position in sorted(candidates):
+                if not test(point_abstracts[point_position]):
+                    continue
+                if base_attributes is None:
+                    base_attributes = polygon.attributes()
+                feature = QgsFeature(output_fields)
+                feature.setGeometry(geometry)
+                feature.setAttributes(base_attributes + [point_values[point_position]])
+                joined.append(feature)
+                self._join_sources.append(position)
+
+            feedback.setProgress(int(position * total))
+
+        return polygons.derive(joined, output_fields)
+
+    def _extract_contacts(
+        self, polygons, attribute_field, tolerance, feedback
+    ) -> Tuple['_FeatureBatch', '_FeatureBatch']:
+        """
+        Build the line segments and the geological contacts from the polygon rings.
+
+        Replaces the polygonstolines -> removeduplicatevertices -> explodelines ->
+        dedup -> dissolve -> multiparttosingleparts chain with a single walk over
+        the ring vertices. Vertices closer than the tolerance are removed and
+        snapped to a single integer grid key, every edge is keyed on its sorted
+        endpoint keys and kept once (with the attributes of the first polygon it
+        was seen in). Edges shared by two polygons of the same unit are not
+        contacts; the remaining edges of each geological unit are line-merged
+        and written as single-part contacts.
+        """
+        fields = polygons.fields
+        attribute_index = fields.lookupField(attribute_field)
+
+        # Grid keys are computed by multiplication; 0 keeps exact coordinates
+        scale = 1.0 / tolerance if tolerance > 0 else 0.0
+
+        count = len(polygons.features)
+        total = 100.0 / count if count > 0 else 0
+        # Source polygon of each joined feature, as recorded by the join. A
+        # polygon joined to several points is walked once: every edge of its
+        # later copies has already been seen.
+        sources = self._join_sources if len(self._join_sources) == count else range(count)
+        walked = set()
+        # edge key -> attribute value of the first polygon it was seen in
+        owners = {}
+        # Segments are kept column-wise: the geometry of each unique edge and
+        # the index, in rows, of the attributes of the polygon it came from.
+        # Features are only built once, when the columns are written out.
+        rows = []
+        segment_lines = []
+        segment_rows = []
+        # attribute value -> (row of the first segment, edge key -> segment geometry)
+        groups = {}
+        interior = 0
+
+        for current, polygon in enumerate(polygons.features):
+            if feedback.isCanceled():
+                break
+            if sources[current] in walked:
+                continue
+            walked.add(sources[current])
+
+            geometry = polygon.geometry()
+            if geometry.isNull():
+                continue
+            # Same vertex cleaning as native:removeduplicatevertices, done in
+            # one C++ pass before the rings are walked. With no tolerance only
+            # exact repeats would go, and those already share a grid key, so
+            # the geometry is left untouched (and not detached/copied).
+            if tolerance > 0:
+                geometry.removeDuplicateNodes(tolerance)
+            attributes = polygon.attributes()
+            value = attributes[attribute_index]
+            row = len(rows)
+            rows.append(attributes)
+
+            group_edges = None
+            for ring in self._polygon_rings(geometry):
+                ring = ring.points()
+                keys = self._ring_keys(ring, scale)
+                for previous, point, previous_key, key in zip(ring, ring[1:], keys, keys[1:]):
+                    if previous_key == key:
+                        continue
+                    edge_key = (previous_key, key) if previous_key < key else (key, previous_key)
+                    if edge_key in owners:
+                        # Edge shared by two polygons of the same unit: it is
+                        # not a contact, so it leaves the unit's merge list
+                        if owners[edge_key] == value and edge_key in groups[value][1]:
+                            del groups[value][1][edge_key]
+                            interior += 1
+                        continue
+                    owners[edge_key] = value
+                    # One geometry shared by the segment feature and the
+                    # unit's merge list (implicitly shared, no copy)
+                    line = QgsGeometry.fromPolylineXY([QgsPointXY(previous), QgsPointXY(point)])
+                    segment_lines.append(line)
+                    segment_rows.append(row)
+                    if group_edges is None:
+                        group_edges = groups.setdefault(value, (row, {}))[1]
+                    group_edges[edge_key] = line
+
+            feedback.setProgress(int(current * total))
+
+        segments = []
+        for line, row in zip(segment_lines, segment_rows):
+            segment = QgsFeature(fields)
+            segment.setGeometry(line)
+            segment.setAttributes(rows[row])
+            segments.append(segment)
+
+        contacts = []
+        for row, group_edges in groups.values():
+            if feedback.isCanceled():
+                break
+            if not group_edges:
+                continue
+            # Segments of a polygon coverage only meet at their endpoints, so
+            # a plain collect + line merge is enough; no planar union needed.
+            merged = QgsGeometry.collectGeometry(list(group_edges.values())).mergeLines()
+            for part in merged.asGeometryCollection():
+                contact = QgsFeature(fields)
+                contact.setGeometry(part)
+                contact.setAttributes(rows[row])
+                contacts.append(contact)
+
+        feedback.pushInfo(self.tr(
+            '  {} unique segments ({} inside a single unit) merged into {} geological units'
+        ).format(len(segments), interior, len(groups)))
+
+        return (polygons.derive(segments, wkb_type=_WKB_LINESTRING),
+                polygons.derive(contacts, wkb_type=_WKB_LINESTRING))
+
+    @staticmethod
+    def _polygon_rings(geometry: QgsGeometry):
+        """
+        Yield the exterior and interior rings of every polygon part.
+
+        The rings are read straight from the abstract geometry, without first
+        converting the whole (multi)polygon into nested point lists.
+        """
+        for part in geometry.constParts():
+            yield part.exteriorRing()
+            for i in range(part.numInteriorRings()):
+                yield part.interiorRing(i)
+
+    @staticmethod
+    def _ring_keys(ring, scale) -> List[Any]:
+        """
+        Grid key of each ring vertex.
+
+        The snapped column and row are packed into one int, which hashes and
+        compares faster than a tuple; exact coordinates are used when scale is 0.
+        """
+        if scale:
+            return [
+                (round(point.x() * scale) << 64) | (round(point.y() * scale) & _GRID_ROW_MASK)
+                for point in ring
+            ]
+        return [(point.x(), point.y()) for point in ring]
 
     # ========================================================================
     # Validation and Quality Control
     # ========================================================================
 
-    def _validate_attribute_join(self, output_layer, attribute_field, context, feedback) -> None:
-        try:
-            layer = QgsVectorLayer(output_layer, 'temp', 'ogr')
-            if not layer.isValid():
-                feedback.pushWarning(self.tr('Could not validate attribute joining'))
-                return
-
-            feature_count = layer.featureCount()
-            if feature_count == 0:
-                feedback.pushWarning(
-                    self.tr('Warning: No polygons received geological attributes!')
-                )
-                feedback.pushWarning(
-                    self.tr('Check that points are located inside polygons')
-                )
-            else:
-                feedback.pushInfo(
-                    self.tr(f'  ✓ {feature_count} polygons successfully attributed')
-                )
-        except Exception as e:
-            feedback.pushWarning(self.tr(f'Could not validate results: {str(e)}'))
+    def _validate_attribute_join(self, geological_polygons, feedback) -> None:
+        feature_count = len(geological_polygons.features)
+        if feature_count == 0:
+            feedback.pushWarning(
+                self.tr('Warning: No polygons received geological attributes!')
+            )
+            feedback.pushWarning(
+                self.tr('Check that points are located inside polygons')
+            )
+        else:
+            feedback.pushInfo(
+                self.tr('  ✓ {} polygons successfully attributed').format(feature_count)
+            )
+
+    def _get_layer(self, output: str, context: Any) -> Optional[QgsVectorLayer]:
+        """
+        Return the layer behind an output, opened at most once per run.
+
+        Layers already held by the context (memory / temporary outputs) are
+        reused as-is; anything else is opened through OGR.
+        """
+        if output not in self._layer_cache:
+            layer = QgsProcessingUtils.mapLayerFromString(output, context)
+            if layer is None:
+                layer = QgsVectorLayer(output, 'temp', 'ogr')
+            self._layer_cache[output] = layer
+        return self._layer_cache[output]
 
     def _print_summary(self, results, context, feedback) -> None:
         try:
             for output_name, output_path in results.items():
+                if output_path is None:
+                    continue
                 try:
-                    layer = QgsVectorLayer(output_path, 'temp', 'ogr')
-                    if layer.isValid():
-                        count = layer.featureCount()
-                        geom_type = _wkb_display_string(layer.wkbType())  # ← QGIS 4.0: Qgis.displayString()
-                        feedback.pushInfo(
-                            self.tr(f'  - {output_name}: {count} features ({geom_type})')
-                        )
+                    # Outputs written by _write_sink are described from what
+                    # was written; only other outputs open their layer
+                    written = self._written_outputs.get(output_path)
+                    if written is not None:
+                        count, wkb_type = written
+                    else:
+                        layer = self._get_layer(output_path, context)
+                        if layer is None or not layer.isValid():
+                            continue
+                        count, wkb_type = layer.featureCount(), layer.wkbType()
+                    geom_type = _wkb_display_string(wkb_type)  # ← QGIS 4.0: Qgis.displayString()
+                    feedback.pushInfo(
+                        self.tr('  - {}: {} features ({})').format(output_name, count, geom_type)
+                    )
                 except Exception:
                     pass
         except Exception as e:
-            feedback.pushWarning(self.tr(f'Could not generate summary: {str(e)}'))
+            feedback.pushWarning(self.tr('Could not generate summary: {}').format(e))
 
     # ========================================================================
     # Logging Methods
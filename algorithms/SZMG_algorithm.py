@@ -23,10 +23,14 @@ __version__ = '2.0'  # Updated for QGIS 4.0
 
 from typing import Dict, Any, Optional
 import os
+import re
+import threading
 from qgis.core import (
+    QgsApplication,
     QgsProcessing,
     QgsProcessingAlgorithm,
     QgsProcessingUtils,
+    QgsProcessingFeedback,
     QgsProcessingMultiStepFeedback,
     QgsProcessingParameterRasterLayer,
     QgsProcessingParameterVectorLayer,
@@ -34,6 +38,16 @@ from qgis.core import (
     QgsProcessingParameterFeatureSink,
     QgsProcessingParameterNumber,
     QgsCategorizedSymbolRenderer,
+    QgsCoordinateReferenceSystem,
+    QgsCoordinateTransform,
+    QgsDistanceArea,
+    QgsFeature,
+    QgsFeatureRequest,
+    QgsFeatureSink,
+    QgsGeometry,
+    QgsSpatialIndex,
+    QgsUnitTypes,
+    QgsProviderRegistry,
     QgsRasterLayer,
     QgsVectorLayer,
     QgsProcessingException,
@@ -41,6 +55,8 @@ from qgis.core import (
     Qgis,
 )
 from qgis.utils import iface
+from qgis.PyQt.QtCore import Qt
+from osgeo import gdal
 import processing
 
 # ============================================================================
@@ -52,12 +68,30 @@ if Qgis.QGIS_VERSION_INT >= 40000:
     _NUMBER_INTEGER = QgsProcessingParameterNumber.Type.Integer
     _MSG_CRITICAL   = Qgis.MessageLevel.Critical
     _MSG_WARNING    = Qgis.MessageLevel.Warning
+    _SINK_FAST_INSERT = QgsFeatureSink.Flag.FastInsert
+    _DIRECT_CONNECTION = Qt.ConnectionType.DirectConnection
 else:
     _TYPE_POLYGON   = QgsProcessing.TypeVectorPolygon
     _TYPE_ANY_GEOM  = QgsProcessing.TypeVectorAnyGeometry
     _NUMBER_INTEGER = QgsProcessingParameterNumber.Integer
     _MSG_CRITICAL   = Qgis.Critical
     _MSG_WARNING    = Qgis.Warning
+    _SINK_FAST_INSERT = QgsFeatureSink.FastInsert
+    _DIRECT_CONNECTION = Qt.DirectConnection
+
+
+# (key, zone index) of the last zones layer indexed by _zone_index. A run
+# takes the entry while it uses it, so concurrent runs never share one, and
+# the provider releases it in unload() through clear_zone_cache().
+_zone_cache = None
+_zone_cache_lock = threading.Lock()
+
+
+def clear_zone_cache() -> None:
+    """Release the zone index kept for later runs."""
+    global _zone_cache
+    with _zone_cache_lock:
+        _zone_cache = None
 
 
 class SeismicMicrozonationAlgorithm(QgsProcessingAlgorithm):
@@ -88,7 +122,11 @@ class SeismicMicrozonationAlgorithm(QgsProcessingAlgorithm):
     MIN_SLOPE_THRESHOLD     = 0
     MAX_SLOPE_THRESHOLD     = 90
     DEFAULT_MIN_AREA        = 0.0
-    TOTAL_STEPS             = 6
+    TOTAL_STEPS             = 5
+    # GeoTIFF creation options of the slope raster
+    SLOPE_CREATION_OPTIONS  = 'COMPRESS=LZW|PREDICTOR=3|TILED=YES|BLOCKXSIZE=512|BLOCKYSIZE=512|NUM_THREADS=ALL_CPUS'
+    # Joined features per addFeatures call when writing the zones output
+    SINK_BATCH_SIZE         = 1000
 
     def __init__(self) -> None:
         super().__init__()
@@ -140,6 +178,7 @@ class SeismicMicrozonationAlgorithm(QgsProcessingAlgorithm):
             QgsProcessingParameterRasterDestination(
                 self.OUTPUT_SLOPE,
                 self.tr('Slope Map (degrees)'),
+                optional=True,
                 createByDefault=True,
                 defaultValue=None
             )
@@ -164,44 +203,46 @@ class SeismicMicrozonationAlgorithm(QgsProcessingAlgorithm):
         outputs = {}
 
         try:
-            # Step 1 -- Clip DTM
-            feedback.pushInfo(self.tr('Step 1/6: Clipping DTM...'))
+            if parameters.get(self.OUTPUT_SLOPE) is None and parameters.get(self.OUTPUT_ZONES) is None:
+                raise QgsProcessingException(self.tr('No output requested: set the slope map or the high slope zones'))
+
+            # Step 1 -- Clip DTM (as a warped VRT, read through by step 2)
+            feedback.pushInfo(self.tr('Step 1/5: Clipping DTM...'))
             outputs['clipped_dtm'] = self._clip_raster(parameters, context, feedback)
             feedback.setCurrentStep(1)
 
             # Step 2 -- Calculate slope
-            feedback.pushInfo(self.tr('Step 2/6: Calculating slope map...'))
+            feedback.pushInfo(self.tr('Step 2/5: Calculating slope map...'))
             outputs['slope'] = self._calculate_slope(parameters, outputs['clipped_dtm']['OUTPUT'], context, feedback)
-            results[self.OUTPUT_SLOPE] = outputs['slope']['OUTPUT']
+            if parameters.get(self.OUTPUT_SLOPE) is not None:
+                results[self.OUTPUT_SLOPE] = outputs['slope']['OUTPUT']
             feedback.setCurrentStep(2)
 
-            # Step 3 -- Apply threshold
-            feedback.pushInfo(self.tr('Step 3/6: Identifying high slopes...'))
-            outputs['threshold_raster'] = self._apply_slope_threshold(parameters, outputs['slope']['OUTPUT'], context, feedback)
-            feedback.setCurrentStep(3)
-
-            # Step 4 -- Polygonize
-            feedback.pushInfo(self.tr('Step 4/6: Converting to vector...'))
-            outputs['polygons'] = self._polygonize_raster(outputs['threshold_raster']['OUTPUT'], context, feedback)
-            feedback.setCurrentStep(4)
-
-            # Step 5 -- Minimum area filter
-            min_area = parameters.get(self.INPUT_MIN_AREA, 0.0)
-            if min_area > 0:
-                outputs['filtered'] = self._filter_by_min_area(outputs['polygons']['OUTPUT'], min_area, context, feedback)
-            else:
-                outputs['filtered'] = outputs['polygons']
-            feedback.setCurrentStep(5)
-
-            # Step 6 -- Join attributes
-            feedback.pushInfo(self.tr('Step 6/6: Joining attributes...'))
-            outputs['final'] = self._join_attributes(parameters, outputs['filtered']['OUTPUT'], context, feedback)
-            results[self.OUTPUT_ZONES] = outputs['final']['OUTPUT']
+            # Steps 3-5 only feed the zones output: skip them when it is not
+            # requested (an optional sink left unset)
+            if parameters.get(self.OUTPUT_ZONES) is not None:
+                # Step 3 -- Apply threshold
+                feedback.pushInfo(self.tr('Step 3/5: Identifying high slopes...'))
+                outputs['threshold_raster'] = self._apply_slope_threshold(parameters, outputs['slope']['OUTPUT'], context, feedback)
+                feedback.setCurrentStep(3)
+
+                # Step 4 -- Polygonize
+                feedback.pushInfo(self.tr('Step 4/5: Converting to vector...'))
+                outputs['polygons'] = self._vectorize_slopes(outputs['threshold_raster']['OUTPUT'], context, feedback)
+                feedback.setCurrentStep(4)
+
+                # Step 5 -- Minimum area filter and join attributes
+                feedback.pushInfo(self.tr('Step 5/5: Joining attributes...'))
+                min_area = self.parameterAsDouble(parameters, self.INPUT_MIN_AREA, context)
+                outputs['final'] = self._join_attributes(
+                    parameters, outputs['polygons']['OUTPUT'], min_area, context, feedback
+                )
+                results[self.OUTPUT_ZONES] = outputs['final']['OUTPUT']
 
             # --- SALVATAGGIO DATI PER POST-PROCESS ---
             # Salviamo gli ID/Percorsi per ritrovarli dopo il caricamento in mappa
-            self._output_slope_id = results[self.OUTPUT_SLOPE]
-            self._output_zones_id = results[self.OUTPUT_ZONES]
+            self._output_slope_id = results.get(self.OUTPUT_SLOPE, '')
+            self._output_zones_id = results.get(self.OUTPUT_ZONES, '')
             self._slope_threshold = parameters[self.INPUT_SLOPE_THRESHOLD]
 
             feedback.pushInfo(self.tr('Processing completato con successo!'))
@@ -331,30 +372,120 @@ class SeismicMicrozonationAlgorithm(QgsProcessingAlgorithm):
         context: Any,
         feedback: Any,
     ) -> Dict[str, Any]:
-        """Clip DTM raster using vector mask."""
-        return processing.run(
-            'gdal:cliprasterbymasklayer',
-            {
-                'ALPHA_BAND':      False,
-                'CROP_TO_CUTLINE': True,
-                'DATA_TYPE':       0,
-                'EXTRA':           '',
-                'INPUT':           parameters[self.INPUT_DTM],
-                'KEEP_RESOLUTION': False,
-                'MASK':            parameters[self.INPUT_ZONES],
-                'MULTITHREADING':  False,
-                'NODATA':          None,
-                'OPTIONS':         '',
-                'SET_RESOLUTION':  False,
-                'SOURCE_CRS':      'ProjectCrs',
-                'TARGET_CRS':      'ProjectCrs',
-                'TARGET_EXTENT':   parameters[self.INPUT_ZONES],
-                'X_RESOLUTION':    None,
-                'Y_RESOLUTION':    None,
-                'OUTPUT':          QgsProcessing.TEMPORARY_OUTPUT,
-            },
-            context=context, feedback=feedback, is_child_algorithm=True,
-        )
+        """
+        Clip DTM raster using vector mask.
+
+        The clip is written as a warped VRT rather than a GeoTIFF: the warp
+        only stores the cutline and warp options, and the clipped cells are
+        computed on the fly while gdal:slope reads them. Clip and slope thus
+        make a single pass over the DTM, and the clipped copy of the DTM is
+        never written to or read back from disk. The VRT keeps the
+        NUM_THREADS warp option, so the cells are warped on all cores while
+        the slope is computed.
+
+        The target extent is the part of the zones extent covered by the DTM,
+        so no blank cells are warped (and masked against the cutline) where
+        the zones reach beyond the DTM.
+        """
+        dtm = self.parameterAsRasterLayer(parameters, self.INPUT_DTM, context)
+        zones = self.parameterAsVectorLayer(parameters, self.INPUT_ZONES, context)
+        zones_extent = QgsCoordinateTransform(
+            zones.crs(), dtm.crs(), context.transformContext()
+        ).transformBoundingBox(zones.extent())
+        target_extent = dtm.extent().intersect(zones_extent)
+        if target_extent.isEmpty():
+            raise QgsProcessingException(
+                self.tr('The geological seismic zones do not overlap the DTM')
+            )
+
+        # Same warp gdal:cliprasterbymasklayer would run (CRS overridden with
+        # the project CRS, crop to cutline), done in-process: writing a
+        # warped VRT takes no longer than launching the gdalwarp process.
+        mask_path, mask_layer = self._simplified_cutline(dtm, zones, context, feedback), ''
+        if not mask_path:
+            mask_path, mask_layer = self.parameterAsCompatibleSourceLayerPathAndLayerName(
+                parameters, self.INPUT_ZONES, context, ['shp', 'gpkg'], 'gpkg', feedback
+            )
+        arguments = []
+        project_crs = context.project().crs() if context.project() else QgsCoordinateReferenceSystem()
+        if project_crs.isValid():
+            # -s_srs/-t_srs only relabel the DTM, its pixels keep their DTM
+            # coordinates: the target extent stays in the DTM CRS
+            crs = project_crs.toWkt()
+            arguments += ['-s_srs', crs, '-t_srs', crs]
+        arguments += [
+            '-te', str(target_extent.xMinimum()), str(target_extent.yMinimum()),
+            str(target_extent.xMaximum()), str(target_extent.yMaximum()),
+            '-of', 'VRT',
+            '-wo', 'NUM_THREADS=ALL_CPUS',
+            '-cutline', mask_path,
+        ]
+        if mask_layer:
+            arguments += ['-cl', mask_layer]
+        arguments.append('-crop_to_cutline')
+
+        output = QgsProcessingUtils.generateTempFilename('clipped_dtm.vrt')
+        dataset = gdal.Warp(output, dtm.source(), options=gdal.WarpOptions(options=arguments))
+        if dataset is None:
+            raise QgsProcessingException(
+                self.tr('DTM clip failed: {}').format(gdal.GetLastErrorMsg())
+            )
+        # Closing the dataset writes the VRT
+        dataset = None
+        return {'OUTPUT': output}
+
+    def _simplified_cutline(
+        self,
+        dtm: QgsRasterLayer,
+        zones: QgsVectorLayer,
+        context: Any,
+        feedback: Any,
+    ) -> Optional[str]:
+        """
+        Return the zones simplified to half a DTM cell, for use as the clip
+        cutline only, or None to clip with the zones as they are.
+
+        gdalwarp tests the cutline against every cell, so detailed zone
+        outlines cost far more than the DTM resolution can show. A coverage
+        simplification keeps shared zone borders identical, leaving no
+        slivers between zones to be masked out. It needs QGIS 3.36 (GEOS
+        3.12), zones in the DTM CRS and zones forming a valid coverage;
+        otherwise the exact zones are used. The join always uses the
+        exact zones, so zone attributes are unaffected.
+        """
+        if zones.crs() != dtm.crs():
+            return None
+        if QgsApplication.processingRegistry().algorithmById('native:coveragesimplify') is None:
+            return None
+        tolerance = min(dtm.rasterUnitsPerPixelX(), dtm.rasterUnitsPerPixelY()) / 2
+        # An invalid coverage is an expected fallback: the child reports to
+        # a silent feedback so it does not log errors, which still follows
+        # cancellation of the parent (directly, as the algorithm thread has
+        # no event loop to deliver a queued signal)
+        silent = QgsProcessingFeedback()
+        feedback.canceled.connect(silent.cancel, _DIRECT_CONNECTION)
+        if feedback.isCanceled():
+            silent.cancel()
+        try:
+            # Written to a real file: gdalwarp opens the cutline by path and
+            # cannot read a layer from the context's temporary store
+            return processing.run(
+                'native:coveragesimplify',
+                {
+                    'INPUT':             zones,
+                    'TOLERANCE':         tolerance,
+                    'PRESERVE_BOUNDARY': False,
+                    'OUTPUT':            QgsProcessingUtils.generateTempFilename('cutline.gpkg'),
+                },
+                context=context, feedback=silent, is_child_algorithm=True,
+            )['OUTPUT']
+        except QgsProcessingException:
+            if feedback.isCanceled():
+                return None
+            feedback.pushInfo(self.tr('Zones are not a valid coverage: clipping with the exact outlines'))
+            return None
+        finally:
+            feedback.canceled.disconnect(silent.cancel)
 
     def _calculate_slope(
         self,
@@ -363,7 +494,22 @@ class SeismicMicrozonationAlgorithm(QgsProcessingAlgorithm):
         context: Any,
         feedback: Any,
     ) -> Dict[str, Any]:
-        """Calculate slope from DTM in degrees."""
+        """
+        Calculate slope from DTM in degrees.
+
+        When the slope map is not requested it is only an input to the
+        threshold step: it goes to a temporary file that is neither returned
+        nor loaded into the project.
+
+        The Float32 slope is written tiled and LZW-compressed with the
+        floating point predictor, so the reclassification and later reads
+        fetch compact 512x512 blocks instead of uncompressed strips. The
+        blocks are compressed on all cores while gdaldem streams the slope
+        rows, so the compression does not serialize the write.
+        """
+        output = parameters.get(self.OUTPUT_SLOPE)
+        if output is None:
+            output = QgsProcessing.TEMPORARY_OUTPUT
         return processing.run(
             'gdal:slope',
             {
@@ -372,10 +518,10 @@ class SeismicMicrozonationAlgorithm(QgsProcessingAlgorithm):
                 'COMPUTE_EDGES': False,
                 'EXTRA':         '',
                 'INPUT':         input_raster,
-                'OPTIONS':       '',
+                'OPTIONS':       self.SLOPE_CREATION_OPTIONS,
                 'SCALE':         1,
                 'ZEVENBERGEN':   False,
-                'OUTPUT':        parameters[self.OUTPUT_SLOPE],
+                'OUTPUT':        output,
             },
             context=context, feedback=feedback, is_child_algorithm=True,
         )
@@ -387,28 +533,45 @@ class SeismicMicrozonationAlgorithm(QgsProcessingAlgorithm):
         context: Any,
         feedback: Any,
     ) -> Dict[str, Any]:
-        """Binary raster: 1 where slope >= threshold, 0 elsewhere."""
+        """
+        Binary raster: 1 where slope >= threshold, 0 elsewhere.
+
+        The comparison is a two-class reclassification: no expression is
+        parsed, and the mask is written as Byte (with 255 as NoData) rather
+        than as the Float32 raster the raster calculator produces.
+        """
         threshold = parameters[self.INPUT_SLOPE_THRESHOLD]
         return processing.run(
-            'native:modelerrastercalc',
+            'native:reclassifybytable',
             {
-                'CELL_SIZE':  None,
-                'CRS':        'ProjectCrs',
-                'EXPRESSION': f'"A@1" >= {threshold}',
-                'EXTENT':     None,
-                'LAYERS':     slope_raster,
-                'OUTPUT':     QgsProcessing.TEMPORARY_OUTPUT,
+                'INPUT_RASTER':       slope_raster,
+                'RASTER_BAND':        1,
+                # min <= slope < max; empty bounds are open-ended
+                'TABLE':              ['', threshold, 0, threshold, '', 1],
+                'RANGE_BOUNDARIES':   1,
+                'NODATA_FOR_MISSING': False,
+                'NO_DATA':            255,
+                'DATA_TYPE':          0,  # Byte
+                'OUTPUT':             QgsProcessing.TEMPORARY_OUTPUT,
             },
             context=context, feedback=feedback, is_child_algorithm=True,
         )
 
-    def _polygonize_raster(
+    def _vectorize_slopes(
         self,
         threshold_raster: str,
         context: Any,
         feedback: Any,
     ) -> Dict[str, Any]:
-        """Convert binary raster to vector polygons (field = DN)."""
+        """
+        Convert binary raster to vector polygons (field = DN).
+
+        Only the cells inside the zones are vectorized: everything the clip
+        masked out is NoData (255) in the threshold raster, and polygonize
+        skips it through the band's mask. The output therefore holds just
+        the DN=0 and DN=1 polygons that are styled and joined, and needs no
+        extract-by-attribute pass afterwards.
+        """
         return processing.run(
             'gdal:polygonize',
             {
@@ -422,65 +585,207 @@ class SeismicMicrozonationAlgorithm(QgsProcessingAlgorithm):
             context=context, feedback=feedback, is_child_algorithm=True,
         )
 
-    def _extract_high_slopes(
-        self,
-        polygons: str,
-        context: Any,
-        feedback: Any,
-    ) -> Dict[str, Any]:
-        """Extract only DN=1 polygons (high slope areas)."""
-        return processing.run(
-            'native:extractbyattribute',
-            {
-                'FIELD':    'DN',
-                'INPUT':    polygons,
-                'OPERATOR': 0,
-                'VALUE':    '1',
-                'OUTPUT':   QgsProcessing.TEMPORARY_OUTPUT,
-            },
-            context=context, feedback=feedback, is_child_algorithm=True,
+    def _min_area_test(self, layer: QgsVectorLayer, min_area: float, context: Any):
+        """
+        Return a test keeping the geometries of at least min_area, measured
+        with the ellipsoid and area unit $area would use, or None when no
+        minimum area is set.
+
+        The threshold is converted once into the unit measureArea() returns,
+        so each geometry costs a single measurement and comparison.
+        """
+        if min_area <= 0:
+            return None
+        distance_area = QgsDistanceArea()
+        distance_area.setSourceCrs(layer.crs(), context.transformContext())
+        distance_area.setEllipsoid(context.ellipsoid())
+        measured_min_area = min_area / QgsUnitTypes.fromUnitToUnitFactor(
+            distance_area.areaUnits(), context.areaUnit()
         )
+        measure_area = distance_area.measureArea
+
+        def keep(geometry):
+            return measure_area(geometry) >= measured_min_area
+
+        return keep
+
+    def _zone_index(self, zones: QgsVectorLayer, crs: Any, context: Any):
+        """
+        Return the cache key and the zones read in crs: a QgsSpatialIndex of
+        their positions, their geometries and their attributes.
+
+        Runs on the same saved zones file, fields, CRS and transform context
+        reuse the last index built (typically when trying several slope
+        thresholds); the file's size and modification time invalidate it.
+        Layers with unsaved edits or not backed by a file are always read
+        afresh. A reused index is taken out of the cache until the run hands
+        it back with _release_zone_index().
+        """
+        global _zone_cache
+        key = None
+        path = QgsProviderRegistry.instance().decodeUri(zones.providerType(), zones.source()).get('path')
+        if path and os.path.isfile(path) and not zones.isModified():
+            stat = os.stat(path)
+            key = (
+                zones.source(), zones.subsetString(), stat.st_mtime, stat.st_size,
+                tuple(zones.fields().names()), crs.toWkt(),
+                context.transformContext().coordinateOperations()
+            )
+            with _zone_cache_lock:
+                cached = _zone_cache
+                if cached is not None and cached[0] == key:
+                    _zone_cache = None
+                    return cached
+
+        # Zones are read in the polygon CRS and indexed by their position
+        request = QgsFeatureRequest().setDestinationCrs(crs, context.transformContext())
+        index = QgsSpatialIndex()
+        zone_geometries = []
+        zone_attributes = []
+        for position, zone in enumerate(zones.getFeatures(request)):
+            geometry = zone.geometry()
+            zone_geometries.append(geometry)
+            zone_attributes.append(zone.attributes())
+            if not geometry.isNull():
+                index.addFeature(position, geometry.boundingBox())
+
+        return key, (index, zone_geometries, zone_attributes)
+
+    def _release_zone_index(self, key: Any, zone_index: Any) -> None:
+        """Keep a zone index returned by _zone_index() for later runs."""
+        global _zone_cache
+        if key is None:
+            return
+        with _zone_cache_lock:
+            _zone_cache = (key, zone_index)
 
-    def _filter_by_min_area(
+    def _join_attributes(
         self,
-        polygons: str,
+        parameters: Dict[str, Any],
+        extracted_polygons: str,
         min_area: float,
         context: Any,
         feedback: Any,
     ) -> Dict[str, Any]:
-        """Remove polygons whose area is below min_area (CRS units squared)."""
-        return processing.run(
-            'native:extractbyexpression',
-            {
-                'INPUT':      polygons,
-                'EXPRESSION': f'$area >= {min_area}',
-                'OUTPUT':     QgsProcessing.TEMPORARY_OUTPUT,
-            },
-            context=context, feedback=feedback, is_child_algorithm=True,
-        )
+        """
+        Spatially join seismic zone attributes to the slope polygons.
+
+        The zones are indexed in a QgsSpatialIndex and each slope polygon only
+        tests the zones overlapping its bounding box, instead of running
+        native:joinattributesbylocation. As in the one-to-many join it
+        replaces, a polygon is written once per matching zone and polygons
+        outside every zone are kept with empty zone attributes.
+
+        The polygons are streamed from the polygonize output: those below
+        min_area are skipped as they are read, and joined features reach the
+        sink in SINK_BATCH_SIZE chunks, so memory holds the zones and one
+        chunk rather than a copy of the whole polygon layer.
+        """
+        polygons = QgsProcessingUtils.mapLayerFromString(extracted_polygons, context)
+        zones = self.parameterAsVectorLayer(parameters, self.INPUT_ZONES, context)
+        output_fields = QgsProcessingUtils.combineFields(polygons.fields(), zones.fields())
+
+        key, zone_index = self._zone_index(zones, polygons.crs(), context)
+        try:
+            return self._write_joined(
+                parameters, polygons, zones, output_fields, zone_index, min_area, context, feedback
+            )
+        finally:
+            self._release_zone_index(key, zone_index)
 
-    def _join_attributes(
+    def _write_joined(
         self,
         parameters: Dict[str, Any],
-        extracted_polygons: str,
+        polygons: QgsVectorLayer,
+        zones: QgsVectorLayer,
+        output_fields: Any,
+        zone_index: Any,
+        min_area: float,
         context: Any,
         feedback: Any,
     ) -> Dict[str, Any]:
-        """Spatially join seismic zone attributes to the slope polygons."""
-        return processing.run(
-            'native:joinattributesbylocation',
-            {
-                'DISCARD_NONMATCHING': False,
-                'INPUT':               extracted_polygons,
-                'JOIN':                parameters[self.INPUT_ZONES],
-                'JOIN_FIELDS':         [''],
-                'METHOD':              0,
-                'PREDICATE':           [0, 1, 2, 4, 5, 6],
-                'PREFIX':              '',
-                'OUTPUT':              parameters[self.OUTPUT_ZONES],
-            },
-            context=context, feedback=feedback, is_child_algorithm=True,
-        )
+        """Write the slope polygons joined to the indexed zones to OUTPUT_ZONES."""
+        index, zone_geometries, zone_attributes = zone_index
+
+        # When the zones output is a temporary or a new file filled in one
+        # go, GeoPackage/SQLite outputs are opened without a sync to disk on
+        # every transaction commit. A layer added to an existing file keeps
+        # the synchronous commits, as a crash could corrupt the whole file.
+        # The option is thread-local and only read when the writer opens the
+        # dataset, so it is restored right after.
+        synchronous = gdal.GetThreadLocalConfigOption('OGR_SQLITE_SYNCHRONOUS', None)
+        if self._is_new_file(parameters, self.OUTPUT_ZONES, context):
+            gdal.SetThreadLocalConfigOption('OGR_SQLITE_SYNCHRONOUS', 'OFF')
+        try:
+            sink, dest_id = self.parameterAsSink(
+                parameters, self.OUTPUT_ZONES, context,
+                output_fields, polygons.wkbType(), polygons.crs()
+            )
+        finally:
+            gdal.SetThreadLocalConfigOption('OGR_SQLITE_SYNCHRONOUS', synchronous)
+        if sink is None:
+            raise QgsProcessingException(self.invalidSinkError(parameters, self.OUTPUT_ZONES))
+
+        keep = self._min_area_test(polygons, min_area, context)
+        no_zone = [None] * zones.fields().count()
+        count = polygons.featureCount()
+        total = 100.0 / count if count > 0 else 0
+        joined = []
+        for current, polygon in enumerate(polygons.getFeatures()):
+            if feedback.isCanceled():
+                break
+
+            geometry = polygon.geometry()
+            if keep is not None and not keep(geometry):
+                continue
+            matches = []
+            candidates = index.intersects(geometry.boundingBox()) if not geometry.isNull() else []
+            if candidates:
+                # Raster-derived polygons are disjoint and mostly fall in a
+                # single zone: the engine is only prepared when several zones
+                # are tested against it, since preparing a staircase outline
+                # costs more than the one test it would speed up
+                engine = QgsGeometry.createGeometryEngine(geometry.constGet())
+                if len(candidates) > 1:
+                    engine.prepareGeometry()
+                # Contains, equals, overlaps, within and crosses all imply
+                # intersects: it is the only test that can add a match
+                for position in sorted(candidates):
+                    if engine.intersects(zone_geometries[position].constGet()):
+                        matches.append(zone_attributes[position])
+
+            attributes = polygon.attributes()
+            for match in matches or [no_zone]:
+                feature = QgsFeature(output_fields)
+                feature.setGeometry(geometry)
+                feature.setAttributes(attributes + match)
+                joined.append(feature)
+            # Progress is reported with each chunk written rather than for
+            # every polygon, which would emit a signal per raster region
+            if len(joined) >= self.SINK_BATCH_SIZE:
+                sink.addFeatures(joined, _SINK_FAST_INSERT)
+                joined = []
+                feedback.setProgress(int(current * total))
+
+        if joined:
+            sink.addFeatures(joined, _SINK_FAST_INSERT)
+        return {'OUTPUT': dest_id}
+
+    def _is_new_file(self, parameters: Dict[str, Any], name: str, context: Any) -> bool:
+        """
+        Return True if the destination of output `name` is a temporary output
+        or a plain file path that does not exist yet.
+
+        Provider URIs (ogr:, postgres:, ...) and existing files, e.g. a new
+        layer in a user GeoPackage, return False.
+        """
+        destination = self.parameterAsOutputLayer(parameters, name, context)
+        if not destination or destination == QgsProcessing.TEMPORARY_OUTPUT:
+            return True
+        if re.match(r'^[A-Za-z_]{2,}:', destination):
+            return False
+        path = QgsProviderRegistry.instance().decodeUri('ogr', destination).get('path') or destination
+        return not os.path.exists(path)
 
     # =========================================================================
     # Logging
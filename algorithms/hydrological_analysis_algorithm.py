@@ -22,6 +22,9 @@ __date__ = '2026-02-13'
 __copyright__ = '(C) 2026 by Giuseppe Cosentino'
 __version__ = '2.0'  # Updated for QGIS 4.0
 
+import os
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
 from typing import Dict, Any, Optional
 from dataclasses import dataclass
 
@@ -32,10 +35,14 @@ from qgis.core import (
     QgsProcessingMultiStepFeedback,
     QgsProcessingParameterRasterLayer,
     QgsProcessingParameterNumber,
+    QgsProcessingParameterBoolean,
     QgsProcessingParameterVectorDestination,
     QgsProcessingParameterRasterDestination,
     QgsProcessingParameterFeatureSink,
     QgsProcessingException,
+    QgsProcessingUtils,
+    QgsFeatureSink,
+    QgsFeatureRequest,
     QgsRasterLayer,
     QgsMessageLog,
     Qgis
@@ -58,6 +65,12 @@ if Qgis.QGIS_VERSION_INT >= 40000:
     _MSG_WARNING  = Qgis.MessageLevel.Warning
     _MSG_INFO     = Qgis.MessageLevel.Info
 
+    # Sink flags
+    _SINK_FAST_INSERT = QgsFeatureSink.Flag.FastInsert
+
+    # Feature request flags
+    _REQUEST_NO_GEOMETRY = Qgis.FeatureRequestFlag.NoGeometry
+
 else:
     # Source types
     _TYPE_LINE = QgsProcessing.TypeVectorLine
@@ -71,146 +84,15 @@ else:
     _MSG_WARNING  = Qgis.Warning
     _MSG_INFO     = Qgis.Info
 
+    # Sink flags
+    _SINK_FAST_INSERT = QgsFeatureSink.FastInsert
 
-@dataclass
-class HydrologicalParameters:
-    """
-    Data class for hydrological analysis parameters.
-    
-    Attributes:
-        min_slope: Minimum slope in degrees for fill sinks algorithm
-        min_basin_size: Minimum basin size in cells for stream delineation
-        iterations: Number of smoothing iterations
-        max_angle: Maximum vertex angle for smoothing in degrees
-        offset: Smoothing offset value (0.0-1.0)
-    """
-    min_slope: float
-    min_basin_size: int
-    iterations: int
-    max_angle: int
-    offset: float
-    
-    def validate(self) -> tuple[bool, str]:
-        """
-        Validate parameter ranges.
-        
-        Returns:
-            Tuple of (is_valid, error_message)
-        """
-        if not 0.01 <= self.min_slope <= 90:
-            return False, f"Minimum slope must be between 0.01 and 90 degrees (got {self.min_slope})"
-        
-        if self.min_basin_size < 1:
-            return False, f"Minimum basin size must be >= 1 (got {self.min_basin_size})"
-        
-        if not 1 <= self.iterations <= 10:
-            return False, f"Iterations must be between 1 and 10 (got {self.iterations})"
-        
-        if not 0 <= self.max_angle <= 360:
-            return False, f"Maximum angle must be between 0 and 360 degrees (got {self.max_angle})"
-        
-        if not 0.01 <= self.offset <= 1.0:
-            return False, f"Offset must be between 0.01 and 1.0 (got {self.offset})"
-        
-        return True, ""
+    # Feature request flags
+    _REQUEST_NO_GEOMETRY = QgsFeatureRequest.NoGeometry
 
 
-class HydrologicalAnalysisStreams(QgsProcessingAlgorithm):
-    """
-    QGIS Processing Algorithm for comprehensive hydrological stream network analysis.
-    
-    This algorithm performs a complete hydrological analysis workflow on a Digital
-    Terrain Model (DTM) to extract drainage networks and hydrological features.
-    
-    The analysis includes:
-    1. Depression filling using Wang & Liu algorithm
-    2. Flow direction and accumulation calculation
-    3. Stream network delineation
-    4. Topographic indices computation
-    5. Vector stream network extraction and smoothing
-    
-    Output products:
-    - Filled DTM (depressions removed)
-    - Drainage direction raster
-    - Stream network (raster and vector)
-    - Half-basin delineation
-    - Topographic Convergence Index (TCI)
-    - Smoothed vector stream network
-    
-    Applications:
-    - Watershed delineation
-    - Flood risk assessment
-    - Erosion modeling
-    - Hydrological modeling
-    - Environmental impact assessment
-    """
-    
-    # Input parameter names
-    INPUT_DTM = 'digital_terrain_model_dtm'
-    MIN_SLOPE = 'minimum_slope_degree'
-    MIN_BASIN_SIZE = 'minimum_size_of_exterior_watershed_basin'
-    ITERATIONS = 'smoothing_iterations'
-    MAX_ANGLE = 'maximum_node_corner_vertex_angle'
-    OFFSET = 'smoothing_offset'
-    
-    # Output parameter names
-    OUTPUT_VECTOR_RAW = 'vector_stream_raw'
-    OUTPUT_SMOOTH = 'smoothed_streams'
-    OUTPUT_FILLED_DTM = 'filled_dtm_wang_liu'
-    OUTPUT_STREAM = 'stream_network_raster'
-    OUTPUT_DRAINAGE = 'drainage_direction'
-    OUTPUT_HALF_BASIN = 'half_basin'
-    OUTPUT_TCI = 'topographic_index_ln_a_tan_b'
-    
-    # Processing constants
-    DEFAULT_MIN_SLOPE = 0.1
-    DEFAULT_MIN_BASIN_SIZE = 100
-    DEFAULT_ITERATIONS = 1
-    DEFAULT_MAX_ANGLE = 180
-    DEFAULT_OFFSET = 0.25
-    GRASS_MEMORY = 300
-    GRASS_CONVERGENCE = 5
-    TOTAL_STEPS = 4
-
-    def __init__(self):
-        """Initialize the algorithm."""
-        super().__init__()
-
-    # ========================================================================
-    # Translation and Metadata Methods
-    # ========================================================================
-    
-    def tr(self, string: str) -> str:
-        """
-        Return a translatable string.
-        
-        Args:
-            string: String to translate
-            
-        Returns:
-            Translated string
-        """
-        return QCoreApplication.translate('Processing', string)
-
-    def name(self) -> str:
-        """Return internal algorithm name."""
-        return 'hydrological_analysis_stream_network'
-
-    def displayName(self) -> str:
-        """Return user-friendly algorithm name."""
-        return self.tr('Hydrological Analysis - Stream Network (HASN)')
-
-    def group(self) -> str:
-        """Return algorithm group."""
-        return self.tr('Hydrology')
-
-    def groupId(self) -> str:
-        """Return internal group ID."""
-        return 'hydrology'
-
-    def shortHelpString(self) -> str:
-        """Return algorithm help documentation."""
-        return self.tr("""<html><body>
+# Help text shown in the algorithm dialog, built once at import
+_SHORT_HELP = """<html><body>
 
 <p>This algorithm performs a comprehensive hydrological analysis on a Digital Terrain Model (DTM)
 to extract drainage networks and compute hydrological indices.</p>
@@ -253,10 +135,17 @@ to extract drainage networks and compute hydrological indices.</p>
 <li>Typical ranges: 50-500 cells depending on resolution</li>
 </ul>
 
+<p><b>Single Flow Direction (D8):</b></p>
+<ul>
+<li>Off by default: r.watershed distributes flow to all downslope neighbours (MFD)</li>
+<li>When enabled, all flow goes to the steepest neighbour (D8, r.watershed -s)</li>
+<li>D8 runs faster on large DTMs but gives narrower flow paths and a different TCI</li>
+</ul>
+
 <p><b>Smoothing Iterations:</b></p>
 <ul>
 <li>Number of smoothing passes applied to vector streams</li>
-<li>Range: 1-10 iterations</li>
+<li>Range: 0-10 iterations (0 copies the raw lines unsmoothed)</li>
 <li>Default: 1 iteration</li>
 <li>More iterations = smoother but less accurate geometries</li>
 </ul>
@@ -264,7 +153,7 @@ to extract drainage networks and compute hydrological indices.</p>
 <p><b>Maximum Vertex Angle (degrees):</b></p>
 <ul>
 <li>Maximum angle for vertex preservation during smoothing</li>
-<li>Range: 0° - 360°</li>
+<li>Range: 0° - 180°</li>
 <li>Default: 180°</li>
 <li>Lower values preserve sharp bends</li>
 <li>180° allows all vertices to be smoothed</li>
@@ -282,15 +171,15 @@ to extract drainage networks and compute hydrological indices.</p>
 
 <p><b>Primary Outputs:</b></p>
 <ul>
-<li><b>Filled DTM:</b> Depression-filled elevation model (raster)</li>
-<li><b>Raw Stream Network:</b> Initial vector stream network without smoothing</li>
+<li><b>Filled DTM:</b> Depression-filled elevation model (raster); it is always computed, but only saved when requested</li>
+<li><b>Raw Stream Network:</b> Initial vector stream network without smoothing (can be skipped when only the smoothed network is needed)</li>
 <li><b>Smoothed Stream Network:</b> Cartographically enhanced stream lines (vector)</li>
 </ul>
 
 <p><b>Optional Hydrological Outputs:</b></p>
 <ul>
 <li><b>Stream Network (Raster):</b> Binary raster of stream cells</li>
-<li><b>Drainage Directions:</b> Flow direction for each cell (D8 algorithm)</li>
+<li><b>Drainage Directions:</b> Flow direction for each cell (the single D8 direction, or the dominant one with MFD routing), coded 1-8 counter-clockwise from East (multiply by 45 for degrees); negative where flow leaves the DTM</li>
 <li><b>Half Basins:</b> Sub-watershed delineation</li>
 <li><b>Topographic Index:</b> ln(a/tan(β)) - wetness index for each cell</li>
 </ul>
@@ -307,7 +196,8 @@ to extract drainage networks and compute hydrological indices.</p>
 <p><b>Flow Analysis:</b></p>
 <ul>
 <li>GRASS GIS r.watershed module</li>
-<li>Multiple Flow Direction (MFD) algorithm available</li>
+<li>Multiple Flow Direction (MFD) routing by default, with the convergence factor set to 5</li>
+<li>Optional Single Flow Direction (D8) routing: faster, but concentrates flow in one cell and changes streams, half basins and TCI</li>
 <li>Computes flow accumulation, direction, and derived indices</li>
 </ul>
 
@@ -351,6 +241,7 @@ to extract drainage networks and compute hydrological indices.</p>
 <li>Consider resampling very high-resolution DTMs</li>
 <li>Processing time increases with DTM size</li>
 <li>GRASS algorithms may require significant memory</li>
+<li>Keep "Use r.external" enabled in the GRASS provider settings so the filled DTM is linked into GRASS instead of copied</li>
 </ul>
 
 <h3>Limitations and Considerations:</h3>
@@ -382,11 +273,185 @@ to extract drainage networks and compute hydrological indices.</p>
 
 
 
-</body></html>""".format(
-            author=__author__,
-            email='giuseppe.cosentino@cnr.it',
-            version=__version__
-        ))
+</body></html>"""
+
+
+@dataclass
+class HydrologicalParameters:
+    """
+    Data class for hydrological analysis parameters.
+    
+    Attributes:
+        min_slope: Minimum slope in degrees for fill sinks algorithm
+        min_basin_size: Minimum basin size in cells for stream delineation
+        iterations: Number of smoothing iterations
+        max_angle: Maximum vertex angle for smoothing in degrees
+        offset: Smoothing offset value (0.0-1.0)
+    """
+    min_slope: float
+    min_basin_size: int
+    iterations: int
+    max_angle: int
+    offset: float
+    
+    # (attribute, lower bound, upper bound, error message) rows checked by
+    # validate(); built once for the class rather than on every call
+    _BOUNDS = (
+        ('min_slope', 0.01, 90,
+         "Minimum slope must be between 0.01 and 90 degrees (got {})"),
+        ('min_basin_size', 1, float('inf'),
+         "Minimum basin size must be >= 1 (got {})"),
+        ('iterations', 0, 10,
+         "Iterations must be between 0 and 10 (got {})"),
+        ('max_angle', 0, 180,
+         "Maximum angle must be between 0 and 180 degrees (got {})"),
+        ('offset', 0.01, 1.0,
+         "Offset must be between 0.01 and 1.0 (got {})"),
+    )
+    
+    def validate(self) -> tuple[bool, str]:
+        """
+        Validate parameter ranges.
+        
+        Returns:
+            Tuple of (is_valid, error_message)
+        """
+        for name, low, high, message in self._BOUNDS:
+            value = getattr(self, name)
+            if not low <= value <= high:
+                return False, message.format(value)
+        
+        return True, ""
+
+
+class HydrologicalAnalysisStreams(QgsProcessingAlgorithm):
+    """
+    QGIS Processing Algorithm for comprehensive hydrological stream network analysis.
+    
+    This algorithm performs a complete hydrological analysis workflow on a Digital
+    Terrain Model (DTM) to extract drainage networks and hydrological features.
+    
+    The analysis includes:
+    1. Depression filling using Wang & Liu algorithm
+    2. Flow direction and accumulation calculation
+    3. Stream network delineation
+    4. Topographic indices computation
+    5. Vector stream network extraction and smoothing
+    
+    Output products:
+    - Filled DTM (depressions removed)
+    - Drainage direction raster
+    - Stream network (raster and vector)
+    - Half-basin delineation
+    - Topographic Convergence Index (TCI)
+    - Smoothed vector stream network
+    
+    Applications:
+    - Watershed delineation
+    - Flood risk assessment
+    - Erosion modeling
+    - Hydrological modeling
+    - Environmental impact assessment
+    """
+    
+    # Input parameter names
+    INPUT_DTM = 'digital_terrain_model_dtm'
+    MIN_SLOPE = 'minimum_slope_degree'
+    MIN_BASIN_SIZE = 'minimum_size_of_exterior_watershed_basin'
+    ITERATIONS = 'smoothing_iterations'
+    MAX_ANGLE = 'maximum_node_corner_vertex_angle'
+    OFFSET = 'smoothing_offset'
+    SINGLE_FLOW = 'single_flow_direction_d8'
+    
+    # Output parameter names
+    OUTPUT_VECTOR_RAW = 'vector_stream_raw'
+    OUTPUT_SMOOTH = 'smoothed_streams'
+    OUTPUT_FILLED_DTM = 'filled_dtm_wang_liu'
+    OUTPUT_STREAM = 'stream_network_raster'
+    OUTPUT_DRAINAGE = 'drainage_direction'
+    OUTPUT_HALF_BASIN = 'half_basin'
+    OUTPUT_TCI = 'topographic_index_ln_a_tan_b'
+    
+    # Outputs reported as rasters by _print_summary (all others are vectors)
+    _RASTER_OUTPUT_KEYS = frozenset({
+        OUTPUT_FILLED_DTM,
+        OUTPUT_STREAM,
+        OUTPUT_DRAINAGE,
+        OUTPUT_HALF_BASIN,
+        OUTPUT_TCI,
+    })
+    
+    # Processing constants
+    DEFAULT_MIN_SLOPE = 0.1
+    DEFAULT_MIN_BASIN_SIZE = 100
+    DEFAULT_ITERATIONS = 1
+    DEFAULT_MAX_ANGLE = 180
+    DEFAULT_OFFSET = 0.25
+    # Only read by r.watershed in its disk-swap (-m) mode; the default
+    # in-memory mode keeps every non-NULL cell resident and visits each once
+    GRASS_MEMORY = 300
+    GRASS_CONVERGENCE = 5
+    # Tiled, float-predicted LZW for the filled DTM; the blocks are
+    # compressed on all cores while the fill itself stays serial
+    FILL_CREATION_OPTIONS = 'COMPRESS=LZW|PREDICTOR=3|TILED=YES|NUM_THREADS=ALL_CPUS'
+    # r.out.gdal createopt (comma separated) for the r.watershed rasters.
+    # r.out.gdal already writes each map in the narrowest type holding its
+    # range (Int16 for the -8..8 drainage codes); DEFLATE then packs the
+    # repeated small codes and NoData runs of the integer rasters
+    GRASS_RASTER_CREATION_OPTIONS = 'TILED=YES,COMPRESS=DEFLATE,NUM_THREADS=ALL_CPUS'
+    # v.out.ogr layer options for a raw stream layer that is only read
+    # back once, in order, by the smoothing step
+    TEMPORARY_VECTOR_LCO = 'SPATIAL_INDEX=NO'
+    SMOOTH_BATCH_SIZE = 1000
+    # Batches with fewer lines are smoothed on the calling thread
+    SMOOTH_PARALLEL_MIN = 64
+    TOTAL_STEPS = 4
+
+    def __init__(self):
+        """Initialize the algorithm."""
+        super().__init__()
+        # Translated once: the log helpers and the summary use them for
+        # every message they emit
+        self._display_name = self.displayName()
+        self._tr_summary = self.tr('Output Summary:')
+        self._tr_raster_count = self.tr('  Raster outputs: {}')
+        self._tr_vector_count = self.tr('  Vector outputs: {}')
+
+    # ========================================================================
+    # Translation and Metadata Methods
+    # ========================================================================
+    
+    def tr(self, string: str) -> str:
+        """
+        Return a translatable string.
+        
+        Args:
+            string: String to translate
+            
+        Returns:
+            Translated string
+        """
+        return QCoreApplication.translate('Processing', string)
+
+    def name(self) -> str:
+        """Return internal algorithm name."""
+        return 'hydrological_analysis_stream_network'
+
+    def displayName(self) -> str:
+        """Return user-friendly algorithm name."""
+        return self.tr('Hydrological Analysis - Stream Network (HASN)')
+
+    def group(self) -> str:
+        """Return algorithm group."""
+        return self.tr('Hydrology')
+
+    def groupId(self) -> str:
+        """Return internal group ID."""
+        return 'hydrology'
+
+    def shortHelpString(self) -> str:
+        """Return algorithm help documentation."""
+        return self.tr(_SHORT_HELP)
 
     def createInstance(self) -> 'HydrologicalAnalysisStreams':
         """
@@ -439,13 +504,22 @@ to extract drainage networks and compute hydrological indices.</p>
             )
         )
         
+        # Flow routing: MFD by default, D8 on request
+        self.addParameter(
+            QgsProcessingParameterBoolean(
+                self.SINGLE_FLOW,
+                self.tr('Single flow direction (D8)'),
+                defaultValue=False
+            )
+        )
+        
         # Smoothing parameters
         self.addParameter(
             QgsProcessingParameterNumber(
                 self.ITERATIONS,
                 self.tr('Smoothing Iterations'),
                 type=_NUMBER_INTEGER,          # ← QGIS 4.0: QgsProcessingParameterNumber.Type.Integer
-                minValue=1,
+                minValue=0,
                 maxValue=10,
                 defaultValue=self.DEFAULT_ITERATIONS
             )
@@ -457,7 +531,7 @@ to extract drainage networks and compute hydrological indices.</p>
                 self.tr('Maximum Vertex Angle (degrees)'),
                 type=_NUMBER_INTEGER,          # ← QGIS 4.0: QgsProcessingParameterNumber.Type.Integer
                 minValue=0,
-                maxValue=360,
+                maxValue=180,
                 defaultValue=self.DEFAULT_MAX_ANGLE
             )
         )
@@ -478,6 +552,7 @@ to extract drainage networks and compute hydrological indices.</p>
             QgsProcessingParameterRasterDestination(
                 self.OUTPUT_FILLED_DTM,
                 self.tr('Filled DTM (Wang & Liu)'),
+                optional=True,
                 createByDefault=True,
                 defaultValue=None
             )
@@ -488,6 +563,7 @@ to extract drainage networks and compute hydrological indices.</p>
                 self.OUTPUT_VECTOR_RAW,
                 self.tr('Raw Stream Network (Vector)'),
                 type=_TYPE_LINE,               # ← QGIS 4.0: Qgis.ProcessingSourceType.VectorLine
+                optional=True,
                 createByDefault=True,
                 defaultValue=None
             )
@@ -630,25 +706,42 @@ to extract drainage networks and compute hydrological indices.</p>
                 offset=self.parameterAsDouble(parameters, self.OFFSET, context)
             )
             
-            # Print processing information
-            feedback.pushInfo(self.tr('=' * 60))
-            feedback.pushInfo(self.tr('Starting Hydrological Stream Network Analysis'))
-            feedback.pushInfo(self.tr('=' * 60))
-            feedback.pushInfo(self.tr(f'DTM: {dtm.name()}'))
-            feedback.pushInfo(self.tr(f'Resolution: {dtm.rasterUnitsPerPixelX():.2f} x {dtm.rasterUnitsPerPixelY():.2f}'))
-            feedback.pushInfo(self.tr(f'Extent: {dtm.extent().toString()}'))
-            feedback.pushInfo(self.tr(f'Minimum slope: {hydro_params.min_slope}°'))
-            feedback.pushInfo(self.tr(f'Basin size threshold: {hydro_params.min_basin_size} cells'))
-            feedback.pushInfo('')
+            # Print processing information as a single message built from
+            # one translated template
+            rule = '=' * 60
+            feedback.pushInfo(self.tr(
+                '{rule}\n'
+                'Starting Hydrological Stream Network Analysis\n'
+                '{rule}\n'
+                'DTM: {name}\n'
+                'Resolution: {res_x:.2f} x {res_y:.2f}\n'
+                'Extent: {extent}\n'
+                'Minimum slope: {min_slope}°\n'
+                'Basin size threshold: {min_basin_size} cells\n'
+            ).format(
+                rule=rule,
+                name=dtm.name(),
+                res_x=dtm.rasterUnitsPerPixelX(),
+                res_y=dtm.rasterUnitsPerPixelY(),
+                extent=dtm.extent().toString(),
+                min_slope=hydro_params.min_slope,
+                min_basin_size=hydro_params.min_basin_size
+            ))
+            
+            # The four steps form a chain (filled DTM -> stream raster ->
+            # raw lines -> smoothed lines), each consuming the previous
+            # output, so they run in sequence on the shared context;
+            # the per-line smoothing is where work is spread over threads
             
             # Step 1: Fill sinks
             feedback.pushInfo(self.tr('Step 1/{}: Filling DTM depressions (Wang & Liu algorithm)...').format(
                 self.TOTAL_STEPS
             ))
             outputs['filled_dtm'] = self._fill_sinks_wang_liu(
-                parameters, hydro_params, context, feedback
+                dtm, parameters, hydro_params, context, feedback
             )
-            results[self.OUTPUT_FILLED_DTM] = outputs['filled_dtm']
+            if parameters.get(self.OUTPUT_FILLED_DTM):
+                results[self.OUTPUT_FILLED_DTM] = outputs['filled_dtm']
             
             feedback.setCurrentStep(1)
             if feedback.isCanceled():
@@ -663,8 +756,10 @@ to extract drainage networks and compute hydrological indices.</p>
             )
             outputs.update(watershed_outputs)
             
-            # Store watershed results
-            results[self.OUTPUT_STREAM] = watershed_outputs.get('stream')
+            # Store watershed results (the stream raster is only reported
+            # when it was requested rather than kept as a temporary input)
+            if parameters.get(self.OUTPUT_STREAM):
+                results[self.OUTPUT_STREAM] = watershed_outputs.get('stream')
             results[self.OUTPUT_DRAINAGE] = watershed_outputs.get('drainage')
             results[self.OUTPUT_HALF_BASIN] = watershed_outputs.get('half_basin')
             results[self.OUTPUT_TCI] = watershed_outputs.get('tci')
@@ -686,7 +781,8 @@ to extract drainage networks and compute hydrological indices.</p>
             outputs['vector_raw'] = self._raster_to_vector(
                 watershed_outputs['stream'], parameters, context, feedback
             )
-            results[self.OUTPUT_VECTOR_RAW] = outputs['vector_raw']
+            if parameters.get(self.OUTPUT_VECTOR_RAW):
+                results[self.OUTPUT_VECTOR_RAW] = outputs['vector_raw']
             
             feedback.setCurrentStep(3)
             if feedback.isCanceled():
@@ -701,11 +797,16 @@ to extract drainage networks and compute hydrological indices.</p>
             )
             results[self.OUTPUT_SMOOTH] = outputs['smoothed']
             
-            # Processing complete
-            feedback.pushInfo('')
-            feedback.pushInfo(self.tr('=' * 60))
-            feedback.pushInfo(self.tr('✓ Hydrological analysis completed successfully!'))
-            feedback.pushInfo(self.tr('=' * 60))
+            feedback.setCurrentStep(4)
+            if feedback.isCanceled():
+                return {}
+            
+            # Processing complete (one message: each pushInfo is a signal
+            # relayed through every enclosing model/batch feedback)
+            rule = '=' * 60
+            feedback.pushInfo('\n{}\n{}\n{}'.format(
+                rule, self.tr('✓ Hydrological analysis completed successfully!'), rule
+            ))
             self._print_summary(results, context, feedback)
             
             return results
@@ -723,6 +824,7 @@ to extract drainage networks and compute hydrological indices.</p>
     
     def _fill_sinks_wang_liu(
         self,
+        dtm: QgsRasterLayer,
         parameters: Dict[str, Any],
         hydro_params: HydrologicalParameters,
         context: Any,
@@ -731,7 +833,12 @@ to extract drainage networks and compute hydrological indices.</p>
         """
         Fill depressions in DTM using Wang & Liu algorithm.
         
+        The native algorithm is already a priority-flood fill running in
+        C++; it is handed the DTM layer resolved by processAlgorithm so the
+        raster is not opened a second time from the parameter value.
+        
         Args:
+            dtm: DTM raster layer
             parameters: Algorithm parameters
             hydro_params: Hydrological parameters
             context: Processing context
@@ -745,10 +852,12 @@ to extract drainage networks and compute hydrological indices.</p>
         """
         alg_params = {
             'BAND': 1,
-            'INPUT': parameters[self.INPUT_DTM],
+            'INPUT': dtm,
             'MIN_SLOPE': hydro_params.min_slope,
-            'CREATION_OPTIONS': None,
-            'OUTPUT_FILLED_DEM': parameters[self.OUTPUT_FILLED_DTM]
+            'CREATION_OPTIONS': self.FILL_CREATION_OPTIONS,
+            # r.watershed always reads the filled DTM: it is kept as a
+            # temporary raster when not requested as an output
+            'OUTPUT_FILLED_DEM': parameters.get(self.OUTPUT_FILLED_DTM) or QgsProcessing.TEMPORARY_OUTPUT
         }
         
         try:
@@ -783,6 +892,10 @@ to extract drainage networks and compute hydrological indices.</p>
         """
         Run GRASS r.watershed for flow analysis and stream delineation.
         
+        TCI ln(a/tan(β)) is derived by r.watershed from the accumulation and
+        slope of the same pass, so it must not be recomputed by a separate
+        raster calculator step: requesting it only adds its export.
+        
         Args:
             filled_dtm: Path to filled DTM
             hydro_params: Hydrological parameters
@@ -801,9 +914,9 @@ to extract drainage networks and compute hydrological indices.</p>
             '-a': False,
             '-b': False,
             '-m': False,
-            '-s': False,
+            '-s': self.parameterAsBoolean(parameters, self.SINGLE_FLOW, context),
             'GRASS_RASTER_FORMAT_META': '',
-            'GRASS_RASTER_FORMAT_OPT': '',
+            'GRASS_RASTER_FORMAT_OPT': self.GRASS_RASTER_CREATION_OPTIONS,
             'GRASS_REGION_CELLSIZE_PARAMETER': 0,
             'GRASS_REGION_PARAMETER': None,
             'blocking': None,
@@ -815,10 +928,12 @@ to extract drainage networks and compute hydrological indices.</p>
             'max_slope_length': None,
             'memory': self.GRASS_MEMORY,
             'threshold': hydro_params.min_basin_size,
-            'drainage': parameters[self.OUTPUT_DRAINAGE],
-            'half_basin': parameters[self.OUTPUT_HALF_BASIN],
-            'stream': parameters[self.OUTPUT_STREAM],
-            'tci': parameters[self.OUTPUT_TCI]
+            # Unrequested outputs stay None and r.watershed skips them; the
+            # stream raster is always needed by the vectorization step
+            'drainage': parameters.get(self.OUTPUT_DRAINAGE),
+            'half_basin': parameters.get(self.OUTPUT_HALF_BASIN),
+            'stream': parameters.get(self.OUTPUT_STREAM) or QgsProcessing.TEMPORARY_OUTPUT,
+            'tci': parameters.get(self.OUTPUT_TCI)
         }
         
         try:
@@ -865,9 +980,12 @@ to extract drainage networks and compute hydrological indices.</p>
         Raises:
             QgsProcessingException: If conversion fails
         """
+        requested = parameters.get(self.OUTPUT_VECTOR_RAW)
         alg_params = {
             '-b': False,
             '-s': False,
+            # Keep the attribute table: the raw and smoothed streams carry
+            # the segment id in 'value', which -t/-v would drop
             '-t': False,
             '-v': False,
             '-z': False,
@@ -876,11 +994,13 @@ to extract drainage networks and compute hydrological indices.</p>
             'GRASS_REGION_PARAMETER': None,
             'GRASS_VECTOR_DSCO': '',
             'GRASS_VECTOR_EXPORT_NOCAT': False,
-            'GRASS_VECTOR_LCO': '',
+            'GRASS_VECTOR_LCO': '' if requested else self.TEMPORARY_VECTOR_LCO,
             'column': 'value',
             'input': stream_raster,
             'type': 0,  # line
-            'output': parameters[self.OUTPUT_VECTOR_RAW]
+            # Only the smoothed lines may be wanted: the raw ones are then
+            # a temporary input to the smoothing step
+            'output': requested or QgsProcessing.TEMPORARY_OUTPUT
         }
         
         try:
@@ -910,6 +1030,16 @@ to extract drainage networks and compute hydrological indices.</p>
         """
         Smooth vector stream geometry for cartographic quality.
         
+        Each line is smoothed in-process with QgsGeometry.smooth(), the same
+        kernel native:smoothgeometry applies, and written straight to the
+        output sink; this saves the child algorithm run and the extra
+        resolution of the raw stream layer it performs. Lines are smoothed
+        in SMOOTH_BATCH_SIZE batches spread over a thread pool.
+        
+        All the Chaikin iterations of a line run inside that one smooth()
+        call, so the intermediate vertex buffers never cross into Python;
+        looping over iterations here would rebuild a QgsGeometry per pass.
+        
         Args:
             vector_streams: Path to vector streams
             hydro_params: Hydrological parameters
@@ -923,24 +1053,88 @@ to extract drainage networks and compute hydrological indices.</p>
         Raises:
             QgsProcessingException: If smoothing fails
         """
-        alg_params = {
-            'INPUT': vector_streams,
-            'ITERATIONS': hydro_params.iterations,
-            'MAX_ANGLE': hydro_params.max_angle,
-            'OFFSET': hydro_params.offset,
-            'OUTPUT': parameters[self.OUTPUT_SMOOTH]
-        }
+        streams = QgsProcessingUtils.mapLayerFromString(vector_streams, context)
+        if streams is None or not streams.isValid():
+            raise QgsProcessingException(
+                self.tr('Could not load the raw stream network: {}').format(vector_streams)
+            )
+        
+        sink, dest_id = self.parameterAsSink(
+            parameters, self.OUTPUT_SMOOTH, context,
+            streams.fields(), streams.wkbType(), streams.crs()
+        )
+        if sink is None:
+            raise QgsProcessingException(self.invalidSinkError(parameters, self.OUTPUT_SMOOTH))
+        
+        # Smoothing arguments are fixed for the run: resolved once here
+        # instead of read off hydro_params for every line.
+        smooth_args = (
+            hydro_params.iterations,
+            hydro_params.offset,
+            -1,
+            hydro_params.max_angle
+        )
+        
+        def smooth(geometry):
+            # A single segment has no corner to round: smoothing would
+            # only add collinear vertices along it
+            if geometry.isNull() or geometry.constGet().nCoordinates() <= 2:
+                return geometry
+            return geometry.smooth(*smooth_args)
+        
+        def smooth_slice(geometries):
+            return [smooth(geometry) for geometry in geometries]
+        
+        # Each worker gets one contiguous slice of the batch rather than one
+        # task per line: short stream pieces smooth faster than a future
+        # can be scheduled, so per-line tasks were mostly queue overhead
+        workers = os.cpu_count() or 1
+        
+        def write(batch):
+            # With 0 iterations the lines are copied as they are
+            if smooth_args[0] > 0:
+                geometries = [feature.geometry() for feature in batch]
+                if workers == 1 or len(geometries) < self.SMOOTH_PARALLEL_MIN:
+                    # Too few lines to repay the hand-off to the pool
+                    smoothed = smooth_slice(geometries)
+                else:
+                    step = -(-len(geometries) // workers)
+                    slices = [geometries[i:i + step] for i in range(0, len(geometries), step)]
+                    smoothed = chain.from_iterable(executor.map(smooth_slice, slices))
+                for feature, geometry in zip(batch, smoothed):
+                    feature.setGeometry(geometry)
+            sink.addFeatures(batch, _SINK_FAST_INSERT)
         
         try:
-            result = processing.run(
-                'native:smoothgeometry',
-                alg_params,
-                context=context,
-                feedback=feedback,
-                is_child_algorithm=True
-            )
+            count = streams.featureCount()
+            if count < 0:
+                # Unknown to the provider: counted with a request that
+                # fetches neither geometry nor attributes
+                request = QgsFeatureRequest().setFlags(_REQUEST_NO_GEOMETRY).setNoAttributes()
+                count = sum(1 for _ in streams.getFeatures(request))
+            if count == 0:
+                # Nothing to smooth: the output is left empty
+                return dest_id
+            total = 100.0 / count
+            # Lines are independent and QgsGeometry.smooth() releases the
+            # GIL, so each batch is smoothed on all cores; features are read
+            # and written on this thread only
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                batch = []
+                for current, feature in enumerate(streams.getFeatures()):
+                    if feedback.isCanceled():
+                        break
+                    
+                    batch.append(feature)
+                    if len(batch) >= self.SMOOTH_BATCH_SIZE:
+                        write(batch)
+                        batch = []
+                        feedback.setProgress(int(current * total))
+                
+                if batch:
+                    write(batch)
             
-            return result['OUTPUT']
+            return dest_id
             
         except Exception as e:
             raise QgsProcessingException(
@@ -966,7 +1160,7 @@ to extract drainage networks and compute hydrological indices.</p>
             feedback: Feedback object
         """
         try:
-            feedback.pushInfo(self.tr('Output Summary:'))
+            feedback.pushInfo(self._tr_summary)
             
             # Count outputs
             raster_outputs = []
@@ -974,22 +1168,20 @@ to extract drainage networks and compute hydrological indices.</p>
             
             for output_name, output_path in results.items():
                 if output_path:
-                    if 'dtm' in output_name.lower() or 'raster' in output_name.lower() or \
-                       'drainage' in output_name.lower() or 'basin' in output_name.lower() or \
-                       'tci' in output_name.lower():
+                    if output_name in self._RASTER_OUTPUT_KEYS:
                         raster_outputs.append(output_name)
                     else:
                         vector_outputs.append(output_name)
             
             if raster_outputs:
-                feedback.pushInfo(self.tr(f'  Raster outputs: {len(raster_outputs)}'))
+                feedback.pushInfo(self._tr_raster_count.format(len(raster_outputs)))
                 for name in raster_outputs:
-                    feedback.pushInfo(self.tr(f'    - {name}'))
+                    feedback.pushInfo(f'    - {name}')
             
             if vector_outputs:
-                feedback.pushInfo(self.tr(f'  Vector outputs: {len(vector_outputs)}'))
+                feedback.pushInfo(self._tr_vector_count.format(len(vector_outputs)))
                 for name in vector_outputs:
-                    feedback.pushInfo(self.tr(f'    - {name}'))
+                    feedback.pushInfo(f'    - {name}')
                     
         except Exception as e:
             feedback.pushWarning(
@@ -1005,7 +1197,7 @@ to extract drainage networks and compute hydrological indices.</p>
         """
         QgsMessageLog.logMessage(
             message, 
-            self.displayName(), 
+            self._display_name, 
             _MSG_CRITICAL  # ← QGIS 4.0: Qgis.MessageLevel.Critical
         )
     
@@ -1018,7 +1210,7 @@ to extract drainage networks and compute hydrological indices.</p>
         """
         QgsMessageLog.logMessage(
             message, 
-            self.displayName(), 
+            self._display_name, 
             _MSG_WARNING   # ← QGIS 4.0: Qgis.MessageLevel.Warning
         )
     
@@ -1031,6 +1223,6 @@ to extract drainage networks and compute hydrological indices.</p>
         """
         QgsMessageLog.logMessage(
             message, 
-            self.displayName(), 
+            self._display_name, 
             _MSG_INFO      # ← QGIS 4.0: Qgis.MessageLevel.Info
         )
\ No newline at end of file